@@ -18,24 +18,49 @@ Version: 1.0
 import os
 import sys
 import argparse
+from collections import OrderedDict
 from pathlib import Path
 import tempfile
 import shutil
 
+DEPS_SENTINEL = Path.home() / ".cache" / "commit_humor_classifier" / "deps_ok"
+
+
 def check_dependencies():
     """Vérifie que toutes les dépendances sont installées"""
+    # Sentinelle : si la vérification a déjà réussi depuis la dernière
+    # (ré)installation de l'interpréteur, inutile de la refaire
     try:
-        import torch
-        import transformers
-        from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-        from huggingface_hub import hf_hub_download, snapshot_download
+        if DEPS_SENTINEL.stat().st_mtime > os.path.getmtime(sys.executable):
+            return True
+    except OSError:
+        pass
+
+    # importlib.metadata ne lit que les dist-info : pas d'import réel de
+    # torch/transformers (~1s et des centaines de Mo) avant load_model
+    from importlib.metadata import version, PackageNotFoundError
+
+    missing = []
+    versions = []
+    for name in ("torch", "transformers", "huggingface_hub"):
+        try:
+            versions.append(f"{name}=={version(name)}")
+        except PackageNotFoundError:
+            missing.append(name)
+
+    if not missing:
         print("✅ Toutes les dépendances sont installées")
+        try:
+            DEPS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
+            DEPS_SENTINEL.write_text("\n".join(versions) + "\n", encoding='utf-8')
+        except OSError:
+            pass
         return True
-    except ImportError as e:
-        print(f"❌ Dépendance manquante : {e}")
-        print("\n🔧 Installation requise :")
-        print("pip install torch transformers accelerate huggingface_hub")
-        return False
+
+    print(f"❌ Dépendances manquantes : {', '.join(missing)}")
+    print("\n🔧 Installation requise :")
+    print("pip install torch transformers accelerate huggingface_hub")
+    return False
 
 def download_model_from_hf(model_id, local_dir):
     """Télécharge le modèle depuis Hugging Face"""
@@ -45,13 +70,18 @@ def download_model_from_hf(model_id, local_dir):
         print(f"   📂 Destination : {local_dir}")
         
         from huggingface_hub import snapshot_download
-        
-        # Télécharger tous les fichiers du modèle
+
+        # Ne télécharger que les fichiers utiles à l'inférence : les poids
+        # safetensors, la config et le tokenizer (pas d'artefacts .bin/.pt)
         snapshot_download(
             repo_id=model_id,
             local_dir=local_dir,
             resume_download=True,
-            local_dir_use_symlinks=False
+            local_dir_use_symlinks=False,
+            allow_patterns=["*.json", "*.txt", "tokenizer*", "*.safetensors",
+                            "vocab*", "merges*", "special_tokens*", "*.py"],
+            ignore_patterns=["*.bin", "*.pt", "*.pth", "*.msgpack", "*.h5", "*.onnx.data"],
+            max_workers=8
         )
         
         print("✅ Modèle téléchargé avec succès")
@@ -67,65 +97,356 @@ def download_model_from_hf(model_id, local_dir):
 
 class CommitHumorClassifier:
     """Classificateur d'humour pour messages de commit"""
-    
-    def __init__(self, model_path="eurobert_full", model_id="LBerthalon/eurobert-commit-humor", seuil=0.35):
+
+    def __init__(self, model_path="eurobert_full", model_id="LBerthalon/eurobert-commit-humor", seuil=0.35,
+                 batch_size=32, max_length=64, fast=False, static_shapes=False,
+                 device=None, dtype=None,
+                 backend='auto', ov_hint='LATENCY', int8=None, trust_remote_code=None):
         """
         Initialise le classificateur
-        
+
         Args:
             model_path (str): Chemin local vers le modèle fusionné
             model_id (str): ID du modèle sur Hugging Face
             seuil (float): Seuil de décision pour la classification
+            batch_size (int): Taille des lots pour predict_batch
+            max_length (int): Longueur max des séquences — le coût de
+                l'attention est en O(L²), et les messages de commit font
+                rarement plus de 30 tokens, d'où un plafond bas par défaut
+            fast (bool): Active les kernels fusionnés (BetterTransformer,
+                torch.compile) — coût de warmup, à réserver aux gros volumes
+            static_shapes (bool): Avec fast, fige les formes — padding
+                systématique à max_length et torch.compile(dynamic=False,
+                fullgraph=True), soit un seul graphe optimisé (CUDA graphs
+                capturables). Plus de tokens paddés par lot, mais zéro
+                garde/recompilation en régime permanent
+            device (str): 'cuda' ou 'cpu' (auto-détecté si None)
+            dtype: dtype torch du modèle (float16 auto sur GPU si None)
+            backend (str): 'auto', 'onnx', 'openvino' ou 'pytorch'
+            ov_hint (str): hint de performance OpenVINO ('LATENCY' pour
+                l'interactif, 'THROUGHPUT' pour le batch)
+            int8 (bool): quantification dynamique INT8 des couches Linear
+                sur le backend PyTorch (auto : activée sur CPU, pas sur
+                CUDA où l'INT8 n'aide qu'avec des kernels dédiés)
+            trust_remote_code (bool): exécution du code Python du dépôt
+                HF (auto : désactivée quand transformers embarque
+                nativement l'architecture EuroBERT)
         """
         self.model_path = model_path
         self.model_id = model_id
         self.seuil = seuil
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.fast = fast
+        self.static_shapes = static_shapes
+        self.device = device
+        self.dtype = dtype
+        self.backend = backend
+        self.ov_hint = ov_hint
+        self.int8 = int8
+        self.trust_remote_code = trust_remote_code
         self.tokenizer = None
         self.model = None
-        self.pipeline = None
-        
+        # Cache LRU des prédictions : "fix typo", "wip"... reviennent des
+        # milliers de fois dans un vrai dépôt, autant ne les encoder qu'une fois
+        self._cache = OrderedDict()
+        self._cache_size = 4096
+
+    def _cache_get(self, text):
+        """Retourne le résultat en cache pour ce texte, ou None"""
+        result = self._cache.get(text)
+        if result is not None:
+            self._cache.move_to_end(text)
+        return result
+
+    def _cache_put(self, text, result):
+        """Insère un résultat dans le cache en évinçant le plus ancien"""
+        self._cache[text] = result
+        self._cache.move_to_end(text)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _onnx_quantized_dir(self):
+        """Répertoire où le modèle ONNX quantifié INT8 est mis en cache"""
+        return f"{self.model_path}_onnx_int8"
+
+    def _load_onnx_int8(self):
+        """
+        Charge (ou crée puis met en cache) une version ONNX quantifiée INT8
+        du modèle pour accélérer l'inférence CPU.
+
+        Returns:
+            Le modèle ORT quantifié, ou None si optimum/onnxruntime est absent
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError:
+            return None
+
+        quantized_dir = self._onnx_quantized_dir()
+        static_file = os.path.join(quantized_dir, "model_int8.onnx")
+        quantized_file = os.path.join(quantized_dir, "model_quantized.onnx")
+
+        try:
+            # Préférer le modèle quantifié statiquement (voir quantize_model.py) :
+            # les échelles d'activation sont déjà calibrées, pas de recalcul par appel
+            if os.path.exists(static_file):
+                print(f"📂 Modèle ONNX INT8 statique trouvé : {static_file}")
+                return ORTModelForSequenceClassification.from_pretrained(
+                    quantized_dir,
+                    file_name="model_int8.onnx"
+                )
+
+            if os.path.exists(quantized_file):
+                print(f"📂 Modèle ONNX INT8 en cache : {quantized_dir}")
+                return ORTModelForSequenceClassification.from_pretrained(
+                    quantized_dir,
+                    file_name="model_quantized.onnx"
+                )
+
+            print("⚙️  Export ONNX du modèle (une seule fois)...")
+            ort_model = ORTModelForSequenceClassification.from_pretrained(
+                self.model_path,
+                export=True
+            )
+
+            print("⚙️  Quantification dynamique INT8 (AVX-512 VNNI)...")
+            ort_model.save_pretrained(quantized_dir)
+            quantizer = ORTQuantizer.from_pretrained(quantized_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+
+            print(f"✅ Modèle ONNX INT8 mis en cache dans {quantized_dir}")
+            return ORTModelForSequenceClassification.from_pretrained(
+                quantized_dir,
+                file_name="model_quantized.onnx"
+            )
+
+        except Exception as e:
+            print(f"⚠️  Quantification ONNX impossible ({e}), retour au modèle PyTorch")
+            return None
+
+    def _load_openvino_int8(self):
+        """
+        Charge (ou compile puis met en cache) une version OpenVINO INT8 du
+        modèle — kernels VNNI + compilation de graphe statique sur CPU Intel
+
+        Returns:
+            Le modèle OV quantifié, ou None si optimum-intel est absent
+        """
+        try:
+            from optimum.intel.openvino import OVModelForSequenceClassification
+        except ImportError:
+            print("⚠️  optimum-intel non installé (pip install optimum[openvino])")
+            return None
+
+        ov_dir = f"{self.model_path}_ov_int8"
+        ov_config = {"PERFORMANCE_HINT": self.ov_hint}
+
+        try:
+            if os.path.exists(ov_dir):
+                print(f"📂 IR OpenVINO INT8 en cache : {ov_dir}")
+                return OVModelForSequenceClassification.from_pretrained(ov_dir, ov_config=ov_config)
+
+            print("⚙️  Export et quantification OpenVINO INT8 (une seule fois)...")
+            ov_model = OVModelForSequenceClassification.from_pretrained(
+                self.model_path,
+                export=True,
+                load_in_8bit=True,
+                ov_config=ov_config
+            )
+            ov_model.save_pretrained(ov_dir)
+            print(f"✅ IR OpenVINO mis en cache dans {ov_dir}")
+            return ov_model
+
+        except Exception as e:
+            print(f"⚠️  Backend OpenVINO impossible ({e}), retour au modèle PyTorch")
+            return None
+
     def load_model(self):
         """Charge le modèle et le tokenizer"""
         try:
-            from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-            
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
             # Vérifier si le modèle existe localement
             if not os.path.exists(self.model_path):
                 print(f"📂 Le modèle local '{self.model_path}' n'existe pas")
                 print(f"🔽 Téléchargement depuis Hugging Face...")
-                
+
                 if not download_model_from_hf(self.model_id, self.model_path):
                     return False
             else:
                 print(f"📂 Modèle local trouvé : {self.model_path}")
-            
+
+            # trust_remote_code en auto : exécuté seulement si transformers
+            # n'embarque pas nativement EuroBERT — sinon on évite d'exécuter
+            # le code Python du dépôt HF (imports en plus + surface d'attaque)
+            if self.trust_remote_code is None:
+                import importlib.util
+                self.trust_remote_code = importlib.util.find_spec("transformers.models.eurobert") is None
+
             print("🔤 Chargement du tokenizer...")
+            # Tokenizer Rust (use_fast) : la tokenisation batch se parallélise
+            # sur tous les cœurs au lieu d'une boucle Python par message
+            os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
             self.tokenizer = AutoTokenizer.from_pretrained(
                 self.model_path,
-                trust_remote_code=True
+                trust_remote_code=self.trust_remote_code,
+                use_fast=True
             )
-            
-            print("🤖 Chargement du modèle...")
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                self.model_path,
-                trust_remote_code=True
-            )
-            
-            print("🔧 Création du pipeline...")
-            self.pipeline = pipeline(
-                'text-classification',
-                model=self.model,
-                tokenizer=self.tokenizer,
-                trust_remote_code=True,
-                top_k=1
-            )
-            
+
+            # Sélection du backend d'inférence accéléré (CPU)
+            if self.backend == 'openvino':
+                self.model = self._load_openvino_int8()
+            elif self.backend == 'onnx':
+                self.model = self._load_onnx_int8()
+            elif self.backend == 'auto':
+                # En auto, ONNX INT8 est réservé à l'inférence CPU : sur une
+                # machine GPU, le chemin PyTorch FP16/autocast est plus
+                # rapide et ne doit pas être court-circuité par optimum.
+                # --backend onnx reste le forçage explicite.
+                has_cuda = self.device == 'cuda'
+                if self.device is None:
+                    try:
+                        import torch
+                        has_cuda = torch.cuda.is_available()
+                    except ImportError:
+                        has_cuda = False
+                if not has_cuda:
+                    self.model = self._load_onnx_int8()
+            if self.model is not None:
+                self.device = 'cpu'
+
+            if self.model is None:
+                import torch
+
+                # Détection device/dtype : FP16 sur GPU divise par deux le
+                # trafic mémoire et active les tensor cores ; FP32 sur CPU
+                if self.device is None:
+                    self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+                if self.dtype is None:
+                    self.dtype = torch.float16 if self.device == 'cuda' else torch.float32
+                elif isinstance(self.dtype, str):
+                    # Accepte 'float16', 'bfloat16'... pour que les appelants
+                    # n'aient pas à importer torch juste pour choisir un dtype
+                    self.dtype = getattr(torch, self.dtype)
+
+                print(f"🤖 Chargement du modèle ({self.device}, {self.dtype})...")
+                # low_cpu_mem_usage + safetensors : les poids sont mmappés
+                # directement au lieu d'allouer ~840 Mo de tenseurs FP32
+                # qui seraient aussitôt écrasés par la lecture du disque
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    self.model_path,
+                    trust_remote_code=self.trust_remote_code,
+                    torch_dtype=self.dtype,
+                    low_cpu_mem_usage=True,
+                    use_safetensors=True
+                ).to(self.device)
+
+                # Quantification dynamique INT8 des couches Linear sur CPU :
+                # l'encodeur est dominé par ses matmuls, qui passent en INT8
+                # (~2x plus rapide, ~4x moins de mémoire) avec une perte
+                # négligeable pour un classifieur binaire
+                use_int8 = self.int8 if self.int8 is not None else self.device == 'cpu'
+                if use_int8:
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("⚡ Quantification dynamique INT8 activée (CPU)")
+
+                # Kernels fusionnés : l'attention de l'encodeur est une suite
+                # d'ops softmax/matmul/layernorm non fusionnées, limitée par le
+                # trafic mémoire. Réservé à --fast à cause du coût de warmup.
+                if self.fast:
+                    self._apply_fast_kernels()
+
+            # Appel direct tokenizer + modèle : pas de couche pipeline HF
+            # (dispatch Python + reshaping liste-de-dicts à chaque appel)
+            if hasattr(self.model, 'eval'):
+                self.model.eval()
+
+            import torch
+            torch.set_num_threads(os.cpu_count())
+
             print("✅ Modèle chargé avec succès")
             return True
-            
+
         except Exception as e:
             print(f"❌ Erreur lors du chargement : {e}")
             return False
+
+    def _apply_fast_kernels(self):
+        """Applique BetterTransformer puis torch.compile quand disponibles"""
+        try:
+            from optimum.bettertransformer import BetterTransformer
+            self.model = BetterTransformer.transform(self.model)
+            print("⚡ BetterTransformer activé (attention fusionnée)")
+        except Exception as e:
+            print(f"⚠️  BetterTransformer indisponible : {e}")
+
+        try:
+            import torch
+            if torch.__version__ < "2.1":
+                raise RuntimeError(f"PyTorch {torch.__version__} < 2.1")
+            if self.static_shapes:
+                # Formes figées (padding à max_length) : un seul graphe
+                # spécialisé, capturable en CUDA graphs — seule la taille
+                # du dernier lot partiel peut encore varier
+                self.model = torch.compile(self.model, mode="reduce-overhead",
+                                           dynamic=False, fullgraph=True)
+            else:
+                # dynamic=True : batch et longueur de séquence varient d'un
+                # lot à l'autre (buckets par longueur), sans quoi chaque
+                # nouvelle forme déclencherait une recompilation complète
+                self.model = torch.compile(self.model, mode="reduce-overhead",
+                                           dynamic=True, fullgraph=False)
+            print("⚡ torch.compile activé")
+
+            # Warmup : la compilation a lieu ici, pas sur le premier vrai
+            # lot — avec des formes figées, sur la forme de production
+            warmup = ["warmup"] * (self.batch_size if self.static_shapes else 1)
+            self._forward(warmup)
+            print("⚡ Compilation terminée (warmup)")
+        except Exception as e:
+            print(f"⚠️  torch.compile indisponible : {e}")
+
+    def _tokenize(self, texts):
+        """Tokenise un lot de textes (exécutable dans un thread de préchargement)"""
+        return self.tokenizer(
+            texts,
+            return_tensors='pt',
+            # Formes figées : toujours padder à max_length pour que le
+            # graphe compilé ne voie qu'une seule longueur de séquence
+            padding='max_length' if self.static_shapes else True,
+            truncation=True,
+            max_length=self.max_length
+        )
+
+    def _forward_encoded(self, inputs):
+        """
+        Exécute un forward sur un lot déjà tokenisé
+
+        Returns:
+            Tensor [n, 2] des probabilités softmax
+        """
+        import torch
+
+        if self.device == 'cuda':
+            # pin_memory + non_blocking : la copie hôte→device devient
+            # asynchrone et peut recouvrir le calcul du lot précédent
+            inputs = {name: tensor.pin_memory().to(self.device, non_blocking=True)
+                      for name, tensor in inputs.items()}
+            with torch.inference_mode(), torch.autocast('cuda', dtype=self.dtype):
+                logits = self.model(**inputs).logits
+        else:
+            with torch.inference_mode():
+                logits = self.model(**inputs).logits
+        return logits.float().softmax(-1).cpu()
+
+    def _forward(self, texts):
+        """Tokenise puis exécute un forward sur une liste de textes"""
+        return self._forward_encoded(self._tokenize(texts))
     
     def predict(self, text):
         """
@@ -137,13 +458,23 @@ class CommitHumorClassifier:
         Returns:
             dict: Résultat avec label et probabilité
         """
-        if not self.pipeline:
+        if not self.model:
             raise RuntimeError("Le modèle n'est pas chargé. Appelez load_model() d'abord.")
-            
-        pipeline_result = self.pipeline(text)
-        result = pipeline_result[0][0]
+
+        cached = self._cache_get(text)
+        if cached is not None:
+            return cached
+
+        probs = self._forward([text])[0]
+        label_id = int(probs.argmax())
+        result = self._build_result(text, {'label': f'LABEL_{label_id}', 'score': float(probs[label_id])})
+        self._cache_put(text, result)
+        return result
+
+    def _build_result(self, text, result):
+        """Applique le seuil à une sortie brute du modèle"""
         score = result['score']
-        
+
         # Conversion du label et application du seuil
         if result['label'] == 'LABEL_1':
             is_funny = score > self.seuil
@@ -151,7 +482,7 @@ class CommitHumorClassifier:
         else:
             is_funny = score < (1 - self.seuil)
             probability = 1 - score
-        
+
         return {
             'text': text,
             'is_funny': is_funny,
@@ -160,18 +491,175 @@ class CommitHumorClassifier:
             'raw_score': score,
             'raw_label': result['label']
         }
-    
+
     def predict_batch(self, texts):
-        """Prédit pour plusieurs messages"""
-        results = []
+        """
+        Prédit pour plusieurs messages en une passe batchée
+
+        Les textes sont triés par longueur et regroupés en buckets quasi
+        homogènes avant le forward : chaque lot n'est paddé que jusqu'à son
+        propre maximum, donc le coût suit le nombre réel de tokens au lieu
+        de max_len × batch. Les résultats sont restitués dans l'ordre
+        d'entrée.
+        """
+        if not self.model:
+            raise RuntimeError("Le modèle n'est pas chargé. Appelez load_model() d'abord.")
+
+        texts = [text.strip() for text in texts]
+
+        # Déduplication + cache : seuls les textes encore jamais vus passent
+        # au modèle, les doublons récupèrent le résultat partagé. Les
+        # résultats de l'appel sont accumulés dans un dict local : le LRU
+        # borné ne sert que de cache entre appels, son éviction sur un lot
+        # plus grand que sa capacité ne peut donc rien faire perdre
+        resolved = {}
+        pending = []
         for text in texts:
+            if text in resolved:
+                continue
+            cached = self._cache_get(text)
+            if cached is not None:
+                resolved[text] = cached
+            else:
+                resolved[text] = None  # réservé, rempli par le forward
+                pending.append(text)
+        if pending:
+            # Tri par longueur tokenisée (la longueur en caractères sert de repli)
+            try:
+                encodings = self.tokenizer(pending, truncation=True, max_length=self.max_length)
+                lengths = [len(ids) for ids in encodings['input_ids']]
+            except Exception:
+                lengths = [len(text) for text in pending]
+            order = sorted(range(len(pending)), key=lambda i: lengths[i])
+
+            import numpy as np
+            from concurrent.futures import ThreadPoolExecutor
+
+            chunks = [[pending[i] for i in order[start:start + self.batch_size]]
+                      for start in range(0, len(order), self.batch_size)]
+
+            # Double-buffering : la tokenisation (CPU) du lot suivant est
+            # lancée avant le forward du lot courant, donc sur GPU le
+            # tokenizer et la copie hôte→device se recouvrent avec le calcul
+            with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                future = prefetcher.submit(self._tokenize, chunks[0]) if chunks else None
+                for idx, chunk in enumerate(chunks):
+                    current = future
+                    if idx + 1 < len(chunks):
+                        future = prefetcher.submit(self._tokenize, chunks[idx + 1])
+                    try:
+                        probs = self._forward_encoded(current.result()).numpy()
+
+                        # Post-traitement vectorisé : seuil et labels calculés en
+                        # une passe NumPy au lieu d'un if/else Python par message
+                        label_ids = probs.argmax(-1)
+                        scores = probs[np.arange(len(probs)), label_ids]
+                        probabilities = probs[:, 1]
+                        funny_flags = probabilities > self.seuil
+
+                        for text, label_id, score, probability, is_funny in zip(
+                                chunk, label_ids, scores, probabilities, funny_flags):
+                            result = {
+                                'text': text,
+                                'is_funny': bool(is_funny),
+                                'label': 'DRÔLE' if is_funny else 'PAS DRÔLE',
+                                'probability': float(probability),
+                                'raw_score': float(score),
+                                'raw_label': f'LABEL_{label_id}'
+                            }
+                            resolved[text] = result
+                            self._cache_put(text, result)
+                    except Exception as e:
+                        start = idx * self.batch_size
+                        print(f"❌ Erreur pour le lot {start}-{start + len(chunk)}: {e}")
+                        for text in chunk:
+                            resolved[text] = {'text': text, 'error': str(e)}
+
+        return [resolved[text] for text in texts]
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "commit_humor_classifier.sock")
+
+
+def serve_mode(classifier, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Mode serveur : garde le modèle chargé en mémoire et répond aux
+    classifications via une socket Unix
+
+    Chaque invocation CLI normale recharge torch/transformers et le modèle
+    (~plusieurs secondes) pour classifier une seule phrase ; ici le coût
+    par message se réduit au forward réel.
+    """
+    import json
+    import socket
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(5)
+
+    print(f"🚀 Serveur démarré sur {socket_path}")
+    print("   Utilisez --client \"message\" pour classifier sans recharger le modèle")
+    print("   Appuyez sur Ctrl+C pour arrêter")
+
+    try:
+        while True:
+            conn, _ = server.accept()
             try:
-                result = self.predict(text.strip())
-                results.append(result)
-            except Exception as e:
-                print(f"❌ Erreur pour '{text}': {e}")
-                results.append({'text': text, 'error': str(e)})
-        return results
+                data = conn.recv(65536).decode('utf-8').strip()
+                if not data:
+                    continue
+                try:
+                    result = classifier.predict(data)
+                except Exception as e:
+                    result = {'text': data, 'error': str(e)}
+                conn.sendall(json.dumps(result, ensure_ascii=False).encode('utf-8'))
+            finally:
+                conn.close()
+    except KeyboardInterrupt:
+        print("\n⏹️  Serveur arrêté")
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def client_mode(text, socket_path=DEFAULT_SOCKET_PATH):
+    """Mode client : envoie un message au serveur --serve et affiche le résultat"""
+    import json
+    import socket
+
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ Aucun serveur sur {socket_path}")
+        print("   Lancez d'abord : python commit_humor_classifier.py --serve")
+        return 1
+
+    try:
+        client.sendall(text.encode('utf-8'))
+        client.shutdown(socket.SHUT_WR)
+        response = b""
+        while True:
+            part = client.recv(65536)
+            if not part:
+                break
+            response += part
+        result = json.loads(response.decode('utf-8'))
+    finally:
+        client.close()
+
+    if 'error' in result:
+        print(f"❌ '{result['text']}' : {result['error']}")
+        return 1
+
+    emoji = "😄" if result['is_funny'] else "😐"
+    print(f"\n📝 '{result['text']}'")
+    print(f"   → {emoji} {result['label']} (prob: {result['probability']:.3f})")
+    return 0
+
 
 def interactive_mode(classifier):
     """Mode interactif"""
@@ -200,23 +688,35 @@ def interactive_mode(classifier):
 
 def batch_mode(classifier, file_path):
     """Mode batch depuis un fichier"""
+    from itertools import islice
+
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            texts = f.readlines()
-        
-        print(f"\n📂 Traitement de {len(texts)} messages depuis '{file_path}'")
-        print("=" * 50)
-        
-        results = classifier.predict_batch(texts)
-        
-        for result in results:
-            if 'error' in result:
-                print(f"❌ '{result['text']}' : {result['error']}")
-            else:
-                emoji = "😄" if result['is_funny'] else "😐"
-                print(f"📝 '{result['text']}'")
-                print(f"   → {emoji} {result['label']} (prob: {result['probability']:.3f})")
-                
+            # Lecture paresseuse : pas de readlines() qui matérialise tout le
+            # fichier avant la première inférence
+            texts = (line.strip() for line in f if line.strip())
+
+            print(f"\n📂 Traitement des messages depuis '{file_path}'")
+            print("=" * 50)
+
+            total = 0
+            while True:
+                chunk = list(islice(texts, classifier.batch_size))
+                if not chunk:
+                    break
+
+                # Les résultats sortent dès que le lot est classifié
+                for result in classifier.predict_batch(chunk):
+                    if 'error' in result:
+                        print(f"❌ '{result['text']}' : {result['error']}")
+                    else:
+                        emoji = "😄" if result['is_funny'] else "😐"
+                        print(f"📝 '{result['text']}'")
+                        print(f"   → {emoji} {result['label']} (prob: {result['probability']:.3f})")
+                total += len(chunk)
+
+            print(f"\n✅ {total} messages traités")
+
     except FileNotFoundError:
         print(f"❌ Fichier '{file_path}' introuvable")
     except Exception as e:
@@ -239,24 +739,47 @@ Exemples d'utilisation:
     parser.add_argument('message', nargs='?', help='Message de commit à classifier')
     parser.add_argument('--interactive', '-i', action='store_true', help='Mode interactif')
     parser.add_argument('--batch', '-b', help='Fichier contenant les messages (un par ligne)')
+    parser.add_argument('--serve', action='store_true', help='Garde le modèle chargé et sert via une socket Unix')
+    parser.add_argument('--client', action='store_true', help='Envoie le message au serveur --serve (pas de rechargement)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help='Chemin de la socket Unix pour --serve/--client')
     parser.add_argument('--seuil', '-s', type=float, default=0.35, help='Seuil de décision (défaut: 0.35)')
+    parser.add_argument('--fast', action='store_true', help='Kernels fusionnés (BetterTransformer/torch.compile), warmup au 1er appel')
+    parser.add_argument('--static-shapes', action='store_true',
+                        help='Avec --fast : padding fixe à max-length et graphe compilé unique (dynamic=False)')
+    parser.add_argument('--max-length', type=int, default=64, help='Longueur max des séquences en tokens (défaut: 64)')
+    parser.add_argument('--backend', choices=['auto', 'onnx', 'openvino', 'pytorch'], default='auto',
+                        help='Backend d\'inférence (défaut: auto)')
     parser.add_argument('--model', '-m', default='eurobert_full', help='Chemin local vers le modèle')
     parser.add_argument('--model-id', default='LBerthalon/eurobert-commit-humor', help='ID du modèle sur Hugging Face')
     
     args = parser.parse_args()
-    
+
+    # Le mode client ne charge ni torch ni le modèle : le serveur s'en charge
+    if args.client:
+        if not args.message:
+            print("❌ --client nécessite un message à classifier")
+            return 1
+        return client_mode(args.message, args.socket)
+
     # Vérification des dépendances
     if not check_dependencies():
         return 1
-    
+
     # Initialisation du classificateur
-    classifier = CommitHumorClassifier(model_path=args.model, model_id=args.model_id, seuil=args.seuil)
-    
+    # OpenVINO : optimiser la latence en interactif, le débit en batch
+    ov_hint = 'THROUGHPUT' if args.batch else 'LATENCY'
+    classifier = CommitHumorClassifier(model_path=args.model, model_id=args.model_id, seuil=args.seuil,
+                                       max_length=args.max_length, fast=args.fast,
+                                       static_shapes=args.static_shapes,
+                                       backend=args.backend, ov_hint=ov_hint)
+
     if not classifier.load_model():
         return 1
-    
+
     # Modes d'utilisation
-    if args.interactive:
+    if args.serve:
+        serve_mode(classifier, args.socket)
+    elif args.interactive:
         interactive_mode(classifier)
     elif args.batch:
         batch_mode(classifier, args.batch)
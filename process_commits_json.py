@@ -43,6 +43,8 @@ import os
 import sys
 import json
 import argparse
+import sqlite3
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
@@ -57,26 +59,92 @@ except ImportError:
     print("   Assurez-vous d'être dans le bon répertoire")
     sys.exit(1)
 
+# Barre de progression : un rafraîchissement throttlé par tqdm au lieu
+# d'un couple print+flush (deux syscalls) par fenêtre traitée
+try:
+    from tqdm.auto import tqdm
+except ImportError:
+    tqdm = None
+
+# Sérialiseur JSON natif (3-10x plus rapide que le module json pur
+# Python) ; repli transparent sur la stdlib s'il n'est pas installé
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class CommitProcessor:
     """Processeur de commits JSON avec classification d'humour"""
     
-    def __init__(self, model_path="eurobert_full", model_id="LBerthalon/eurobert-commit-humor", seuil=0.7):
+    # Correspondance --precision → (dtype du modèle, quantification INT8)
+    PRECISION_MAP = {
+        'fp32': ('float32', False),
+        'fp16': ('float16', False),
+        'bf16': ('bfloat16', False),
+        'int8': ('float32', True),
+    }
+
+    def __init__(self, model_path="eurobert_full", model_id="LBerthalon/eurobert-commit-humor", seuil=0.7,
+                 int8=None, precision=None, engine='auto', trust_remote_code=None):
         """
         Initialise le processeur
-        
+
         Args:
             model_path (str): Chemin local vers le modèle
             model_id (str): ID du modèle sur Hugging Face
             seuil (float): Seuil de classification
+            int8 (bool): Quantification INT8 du modèle (auto si None)
+            precision (str): 'fp32', 'fp16', 'bf16' ou 'int8' (auto si None :
+                fp16 sur GPU, fp32+int8 sur CPU)
+            engine (str): moteur d'inférence — 'auto', 'onnx', 'openvino'
+                ou 'pytorch'
+            trust_remote_code (bool): exécution du code du dépôt HF
+                (auto si None)
         """
-        self.classifier = CommitHumorClassifier(model_path, model_id, seuil)
-        self.processed_commits = set()  # Cache des commits déjà traités
+        dtype = None
+        if precision is not None:
+            dtype, int8 = self.PRECISION_MAP[precision]
+        self.classifier = CommitHumorClassifier(model_path, model_id, seuil, dtype=dtype,
+                                                int8=int8, backend=engine, ov_hint='THROUGHPUT',
+                                                trust_remote_code=trust_remote_code)
+        # Cache des commits déjà traités. Avec pybloomfilter3 : filtre de
+        # Bloom mmappé (~quelques Mo pour 10M d'IDs contre ~1 Go pour un
+        # set de chaînes SHA), persistant entre les runs --watch. Le rare
+        # faux positif saute un commit non traité — acceptable, le cache
+        # SQLite couvre les chemins où l'exactitude compte. Repli sur un
+        # set en mémoire si la dépendance est absente.
+        try:
+            from pybloomfilter import BloomFilter
+            self.processed_commits = BloomFilter(10_000_000, 1e-4, "processed.bloom")
+        except ImportError:
+            self.processed_commits = set()
+
+        # Cache persistant message → verdict entre les exécutions : les
+        # corpus de commits sont massivement dupliqués ("fix", "wip",
+        # messages d'examen générés...), un SELECT remplace alors un
+        # forward complet du transformer
+        # check_same_thread=False : en mode --watch, les accès viennent du
+        # thread de dispatch watchdog et non du thread principal ; ils sont
+        # déjà sérialisés (un seul thread de dispatch), seul le verrou de
+        # propriété de CPython doit être levé
+        self.db = sqlite3.connect("commit_humor_cache.sqlite", isolation_level=None,
+                                  check_same_thread=False)
+        # Une seule passe de traitement à la fois (thread watchdog vs main)
+        self._watch_lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache("
+            "h BLOB PRIMARY KEY, is_funny INT, conf REAL, label TEXT)"
+        )
         self.stats = {
             "total_processed": 0,
             "funny_count": 0,
             "not_funny_count": 0,
             "start_time": datetime.now()
         }
+        # Confiances accumulées par lot (tableaux NumPy), concaténées une
+        # seule fois au moment d'afficher les statistiques
+        self.all_confidences = []
     
     def load_model(self):
         """Charge le modèle de classification"""
@@ -86,9 +154,13 @@ class CommitProcessor:
     def load_commits_json(self, file_path: str) -> List[Dict[str, Any]]:
         """Charge les commits depuis un fichier JSON"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                commits = json.load(f)
-            
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    commits = orjson.loads(f.read())
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    commits = json.load(f)
+
             if not isinstance(commits, list):
                 raise ValueError("Le fichier JSON doit contenir une liste de commits")
             
@@ -104,6 +176,29 @@ class CommitProcessor:
         except Exception as e:
             print(f"❌ Erreur lors du chargement: {e}")
             return []
+
+    def iter_commits_json(self, file_path: str):
+        """
+        Itère sur les commits d'un fichier JSON sans tout charger en RAM
+
+        Avec ijson, les commits sont produits au fil de la lecture du
+        fichier : la mémoire reste en O(fenêtre) au lieu de O(fichier) et
+        la classification démarre dès les premiers commits lus. Sans
+        ijson, repli transparent sur json.load.
+        """
+        try:
+            import ijson
+        except ImportError:
+            yield from self.load_commits_json(file_path)
+            return
+
+        try:
+            with open(file_path, 'rb') as f:
+                yield from ijson.items(f, 'item')
+        except FileNotFoundError:
+            print(f"❌ Fichier non trouvé: {file_path}")
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement: {e}")
     
     def get_commit_id(self, commit: Dict[str, Any]) -> str:
         """Génère un ID unique pour un commit"""
@@ -111,104 +206,223 @@ class CommitProcessor:
         if 'sha' in commit:
             return commit['sha']
         else:
-            # Créer un hash basé sur le message et les métadonnées
+            # Créer un hash basé sur le message et les métadonnées.
+            # blake2b court plutôt que MD5 : l'ID ne sert que de clé de
+            # dictionnaire, inutile de payer un hash cryptographique complet
             content = f"{commit.get('message', '')}{commit.get('author', {}).get('date', '')}"
-            return hashlib.md5(content.encode()).hexdigest()
+            return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
     
     def extract_message(self, commit: Dict[str, Any]) -> str:
         """Extrait le message du commit"""
         return commit.get('message', '').strip()
+
+    @staticmethod
+    def message_hash(message: str) -> bytes:
+        """Hachage court d'un message, clé du cache persistant"""
+        return hashlib.blake2b(message.encode(), digest_size=16).digest()
+
+    def _cache_lookup(self, digests: List[bytes]) -> Dict[bytes, Dict[str, Any]]:
+        """Récupère en une requête les verdicts déjà en cache"""
+        found = {}
+        # SQLite limite le nombre de paramètres par requête (999 par défaut)
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT h, is_funny, conf, label FROM cache WHERE h IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            for h, is_funny, conf, label in rows:
+                found[h] = {'is_funny': bool(is_funny), 'probability': conf, 'label': label}
+        return found
+
+    def _cache_store(self, entries: List[tuple]):
+        """Insère les nouveaux verdicts (h, is_funny, conf, label) en lot"""
+        if entries:
+            self.db.executemany("INSERT OR IGNORE INTO cache VALUES (?, ?, ?, ?)", entries)
     
     def classify_commit(self, commit: Dict[str, Any]) -> Dict[str, Any]:
         """Classifie un commit et retourne les résultats enrichis"""
-        commit_id = self.get_commit_id(commit)
-        message = self.extract_message(commit)
-        
-        if not message:
-            return {
-                **commit,
-                'humor_classification': {
-                    'message': '',
-                    'is_funny': False,
-                    'confidence': 0.0,
-                    'error': 'Message vide'
-                }
-            }
-        
-        try:
-            # Classification
-            result = self.classifier.predict(message)
-            
-            # Mise à jour des statistiques
-            self.stats['total_processed'] += 1
-            if result['is_funny']:
-                self.stats['funny_count'] += 1
+        return self.classify_commits_batch([commit])[0]
+
+    def classify_commits_batch(self, commits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classifie un lot de commits en une seule passe batchée
+
+        Un seul appel à predict_batch sur tous les messages : le tokenizer
+        et le forward s'amortissent sur le lot entier au lieu de payer le
+        lancement complet (Python, tokenisation, kernels) à chaque commit.
+        """
+        messages = [self.extract_message(commit) for commit in commits]
+
+        # Seuls les messages non vides passent au modèle ; la carte d'index
+        # permet de replacer chaque prédiction face à son commit d'origine
+        non_empty = [i for i, message in enumerate(messages) if message]
+
+        # Consultation du cache persistant avant tout appel au modèle
+        digests = {i: self.message_hash(messages[i]) for i in non_empty}
+        known = self._cache_lookup(list(set(digests.values())))
+
+        predictions = {}
+        misses = []
+        for i in non_empty:
+            hit = known.get(digests[i])
+            if hit is not None:
+                predictions[i] = hit
             else:
-                self.stats['not_funny_count'] += 1
-            
-            # Marquer comme traité
-            self.processed_commits.add(commit_id)
-            
-            return {
+                misses.append(i)
+
+        if misses:
+            batch_results = self.classifier.predict_batch([messages[i] for i in misses])
+            predictions.update(zip(misses, batch_results))
+            self._cache_store([
+                (digests[i], int(result['is_funny']), result['probability'], result['label'])
+                for i, result in zip(misses, batch_results)
+                if result and not result.get('error')
+            ])
+
+        processed_at = datetime.now().isoformat()
+        results = []
+        for i, commit in enumerate(commits):
+            message = messages[i]
+            result = predictions.get(i)
+
+            if not message:
+                results.append({
+                    **commit,
+                    'humor_classification': {
+                        'message': '',
+                        'is_funny': False,
+                        'confidence': 0.0,
+                        'error': 'Message vide'
+                    }
+                })
+                continue
+
+            if result is None or result.get('error'):
+                error = result.get('error') if result else 'Classification indisponible'
+                print(f"❌ Erreur lors de la classification de {self.get_commit_id(commit)}: {error}")
+                results.append({
+                    **commit,
+                    'humor_classification': {
+                        'message': message,
+                        'is_funny': False,
+                        'confidence': 0.0,
+                        'error': error
+                    }
+                })
+                continue
+
+            results.append({
                 **commit,
                 'humor_classification': {
                     'message': message,
                     'is_funny': result['is_funny'],
-                    'confidence': result['confidence'],
+                    'confidence': result['probability'],
                     'label': result['label'],
-                    'processed_at': datetime.now().isoformat()
-                }
-            }
-            
-        except Exception as e:
-            print(f"❌ Erreur lors de la classification de {commit_id}: {e}")
-            return {
-                **commit,
-                'humor_classification': {
-                    'message': message,
-                    'is_funny': False,
-                    'confidence': 0.0,
-                    'error': str(e)
+                    'processed_at': processed_at
                 }
-            }
-    
-    def process_commits(self, commits: List[Dict[str, Any]], skip_processed=True) -> List[Dict[str, Any]]:
-        """Traite une liste de commits"""
+            })
+            self.processed_commits.add(self.get_commit_id(commit))
+
+        # Statistiques vectorisées : comptage et agrégats calculés en une
+        # passe NumPy sur le lot au lieu d'un test Python par commit
+        import numpy as np
+
+        classified = [r['humor_classification'] for r in results
+                      if not r['humor_classification'].get('error')]
+        flags = np.fromiter((h['is_funny'] for h in classified), dtype=bool, count=len(classified))
+        confidences = np.fromiter((h['confidence'] for h in classified), dtype=np.float32, count=len(classified))
+
+        self.stats['total_processed'] += len(classified)
+        funny = int(flags.sum())
+        self.stats['funny_count'] += funny
+        self.stats['not_funny_count'] += len(classified) - funny
+        self.all_confidences.append(confidences)
+
+        return results
+
+    def process_commits(self, commits, skip_processed=True) -> List[Dict[str, Any]]:
+        """
+        Traite une liste ou un itérable de commits
+
+        Accepte aussi bien une liste chargée en mémoire qu'un générateur
+        (iter_commits_json) : les commits sont accumulés par fenêtres et
+        classifiés dès qu'une fenêtre est pleine, sans attendre la fin du
+        parsing du fichier.
+        """
+        print("\n🔄 Traitement des commits...")
+
+        # Fenêtre large : le tri par longueur de predict_batch opère sur
+        # toute la fenêtre, donc plus elle est grande, plus les lots envoyés
+        # au modèle sont homogènes et moins on paie de tokens PAD ("t" et
+        # les messages multi-lignes ne se retrouvent plus dans le même lot)
         results = []
-        
-        print(f"\n🔄 Traitement de {len(commits)} commits...")
-        
-        for i, commit in enumerate(commits, 1):
-            commit_id = self.get_commit_id(commit)
-            
-            # Skip si déjà traité
-            if skip_processed and commit_id in self.processed_commits:
+        window_size = 1024
+        window = []
+        progress = tqdm(total=None, unit="commit", desc="📊 Classification") if tqdm else None
+
+        def flush():
+            results.extend(self.classify_commits_batch(window))
+            if progress is not None:
+                progress.update(len(window))
+            else:
+                print(f"\r📊 Progression: {len(results)} commits traités", end="", flush=True)
+            window.clear()
+
+        for commit in commits:
+            # Filtrage des commits déjà traités avant tout appel au modèle
+            if skip_processed and self.get_commit_id(commit) in self.processed_commits:
                 continue
-            
-            print(f"\r📊 Progression: {i}/{len(commits)} ({i/len(commits)*100:.1f}%)", end="", flush=True)
-            
-            classified_commit = self.classify_commit(commit)
-            results.append(classified_commit)
-            
-            # Affichage du résultat
-            humor = classified_commit['humor_classification']
-            if not humor.get('error'):
-                emoji = "😄" if humor['is_funny'] else "😐"
-                print(f"\n   {emoji} '{humor['message'][:50]}...' → {humor['label']} ({humor['confidence']:.3f})")
-        
+            window.append(commit)
+            if len(window) >= window_size:
+                flush()
+
+        if window:
+            flush()
+
+        if progress is not None:
+            progress.close()
         print(f"\n✅ Traitement terminé: {len(results)} nouveaux commits traités")
         return results
     
     def save_results(self, results: List[Dict[str, Any]], output_path: str):
         """Sauvegarde les résultats dans un fichier JSON"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(results, default=str,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, indent=2, ensure_ascii=False)
             print(f"💾 Résultats sauvegardés dans {output_path}")
             return True
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
             return False
+
+    def save_results_jsonl(self, results: List[Dict[str, Any]], output_path: str):
+        """
+        Ajoute les résultats en fin de fichier JSONL (un commit par ligne)
+
+        Le coût d'une sauvegarde est en O(nouveaux résultats) au lieu de
+        O(total accumulé) : indispensable en --watch où l'historique peut
+        atteindre des millions de lignes. `jsonl_to_json` reconvertit en
+        tableau JSON pour les consommateurs qui l'exigent.
+        """
+        try:
+            with open(output_path, 'ab') as f:
+                for result in results:
+                    if orjson is not None:
+                        f.write(orjson.dumps(result, default=str))
+                    else:
+                        f.write(json.dumps(result, ensure_ascii=False).encode('utf-8'))
+                    f.write(b"\n")
+            print(f"💾 {len(results)} résultats ajoutés à {output_path}")
+            return True
+        except Exception as e:
+            print(f"❌ Erreur lors de la sauvegarde: {e}")
+            return False
     
     def print_stats(self):
         """Affiche les statistiques de traitement"""
@@ -224,50 +438,120 @@ class CommitProcessor:
         if self.stats['total_processed'] > 0:
             rate = self.stats['total_processed'] / duration.total_seconds()
             print(f"🚀 Vitesse: {rate:.2f} commits/seconde")
+        if self.all_confidences:
+            import numpy as np
+            confidences = np.concatenate(self.all_confidences)
+            print(f"📐 Confiance: moyenne {confidences.mean():.3f}, médiane {np.median(confidences):.3f}")
         print("="*50)
     
+    def _handle_file_change(self, file_path: str, output_path: str = None):
+        """Retraite le fichier surveillé ; seuls les nouveaux commits passent au modèle"""
+        # Sérialise les passes : un événement watchdog arrivant pendant la
+        # passe initiale (ou une rafale d'événements) ne doit pas classifier
+        # les mêmes commits en parallèle ni dupliquer des lignes JSONL
+        with self._watch_lock:
+            print(f"\n📝 Changement détecté dans {file_path}")
+
+            commits = self.iter_commits_json(file_path)
+            new_results = self.process_commits(commits, skip_processed=True)
+
+            if new_results and output_path:
+                # Ajout incrémental : on n'écrit que les nouveaux résultats au
+                # lieu de relire et réécrire tout l'historique à chaque tick
+                self.save_results_jsonl(new_results, output_path)
+
     def watch_file(self, file_path: str, output_path: str = None, interval: int = 5):
-        """Surveille un fichier et traite les nouveaux commits"""
+        """
+        Surveille un fichier et traite les nouveaux commits
+
+        Avec watchdog, la surveillance est événementielle (inotify & co.) :
+        zéro CPU au repos et réaction immédiate au lieu d'un réveil toutes
+        les `interval` secondes. Sans watchdog, repli sur le sondage de
+        taille d'origine.
+        """
         print(f"👁️  Mode surveillance activé pour {file_path}")
-        print(f"🔄 Vérification toutes les {interval} secondes")
         print("   Appuyez sur Ctrl+C pour arrêter\n")
-        
+
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print(f"🔄 watchdog non installé — sondage toutes les {interval} secondes")
+            return self._watch_file_polling(file_path, output_path, interval)
+
+        processor = self
+        watched = os.path.abspath(file_path)
+
+        class _CommitFileHandler(FileSystemEventHandler):
+            """Relaie les modifications du fichier surveillé au processeur"""
+
+            def on_modified(self, event):
+                if not event.is_directory and os.path.abspath(event.src_path) == watched:
+                    processor._handle_file_change(file_path, output_path)
+
+            # Création directe du fichier surveillé
+            on_created = on_modified
+
+            def on_moved(self, event):
+                # Réécriture atomique (écriture d'un fichier temporaire puis
+                # os.replace) : seul un événement "moved" est émis, avec le
+                # fichier surveillé en destination
+                if not event.is_directory and os.path.abspath(event.dest_path) == watched:
+                    processor._handle_file_change(file_path, output_path)
+
+        # Premier passage immédiat : les commits déjà présents sont traités
+        # sans attendre une première modification
+        if os.path.exists(file_path):
+            self._handle_file_change(file_path, output_path)
+
+        # L'observer ne démarre qu'après la passe initiale : un changement
+        # survenant pendant celle-ci sera de toute façon sérialisé par le
+        # verrou de _handle_file_change
+        observer = Observer()
+        observer.schedule(_CommitFileHandler(), str(Path(watched).parent))
+        observer.start()
+
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("\n\n⏹️  Surveillance arrêtée")
+            observer.stop()
+            observer.join()
+            self.print_stats()
+
+    def _watch_file_polling(self, file_path: str, output_path: str = None, interval: int = 5):
+        """Surveillance par sondage de la taille du fichier (repli sans watchdog)"""
         last_size = 0
-        
+
         try:
             while True:
                 if os.path.exists(file_path):
                     current_size = os.path.getsize(file_path)
-                    
+
                     if current_size != last_size:
-                        print(f"\n📝 Changement détecté dans {file_path}")
-                        
-                        commits = self.load_commits_json(file_path)
-                        if commits:
-                            new_results = self.process_commits(commits, skip_processed=True)
-                            
-                            if new_results and output_path:
-                                # Charger les résultats existants
-                                existing_results = []
-                                if os.path.exists(output_path):
-                                    try:
-                                        with open(output_path, 'r', encoding='utf-8') as f:
-                                            existing_results = json.load(f)
-                                    except:
-                                        pass
-                                
-                                # Ajouter les nouveaux résultats
-                                all_results = existing_results + new_results
-                                self.save_results(all_results, output_path)
-                        
+                        self._handle_file_change(file_path, output_path)
                         last_size = current_size
-                
+
                 time.sleep(interval)
-                
+
         except KeyboardInterrupt:
             print("\n\n⏹️  Surveillance arrêtée")
             self.print_stats()
 
+def jsonl_to_json(jsonl_path: str, json_path: str):
+    """Convertit un fichier JSONL accumulé en tableau JSON classique"""
+    try:
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            results = [json.loads(line) for line in f if line.strip()]
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 {len(results)} résultats convertis dans {json_path}")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur lors de la conversion: {e}")
+        return False
+
 def main():
     """Fonction principale"""
     parser = argparse.ArgumentParser(
@@ -290,19 +574,38 @@ Exemples d'utilisation:
     parser.add_argument("--seuil", type=float, default=0.7, help="Seuil de classification (défaut: 0.7)")
     parser.add_argument("--model-path", default="eurobert_full", help="Chemin vers le modèle local")
     parser.add_argument("--model-id", default="LBerthalon/eurobert-commit-humor", help="ID du modèle Hugging Face")
-    
+    parser.add_argument("--int8", action=argparse.BooleanOptionalAction, default=None,
+                        help="Quantification dynamique INT8 sur CPU (défaut: auto — activée sur CPU, pas sur GPU)")
+    parser.add_argument("--precision", choices=["fp32", "fp16", "bf16", "int8"], default=None,
+                        help="Précision du modèle (défaut: auto — fp16 sur GPU, fp32+int8 sur CPU)")
+    parser.add_argument("--engine", choices=["auto", "onnx", "openvino", "pytorch"], default="auto",
+                        help="Moteur d'inférence (défaut: auto — ONNX INT8 si optimum est installé)")
+    parser.add_argument("--convert", metavar="JSON_OUT",
+                        help="Convertit le fichier d'entrée JSONL en tableau JSON puis quitte")
+    parser.add_argument("--trust-remote-code", action=argparse.BooleanOptionalAction, default=None,
+                        help="Exécute le code du dépôt HF (défaut: auto — seulement si transformers "
+                             "n'embarque pas EuroBERT nativement)")
+
     args = parser.parse_args()
     
     # Vérifier que le fichier d'entrée existe
     if not os.path.exists(args.input_file):
         print(f"❌ Fichier non trouvé: {args.input_file}")
         sys.exit(1)
-    
+
+    # Conversion JSONL → JSON : pas besoin de charger le modèle
+    if args.convert:
+        sys.exit(0 if jsonl_to_json(args.input_file, args.convert) else 1)
+
     # Initialiser le processeur
     processor = CommitProcessor(
         model_path=args.model_path,
         model_id=args.model_id,
-        seuil=args.seuil
+        seuil=args.seuil,
+        int8=args.int8,
+        precision=args.precision,
+        engine=args.engine,
+        trust_remote_code=args.trust_remote_code
     )
     
     # Charger le modèle
@@ -312,19 +615,21 @@ Exemples d'utilisation:
     
     # Mode surveillance
     if args.watch:
-        output_path = args.output or f"{Path(args.input_file).stem}_results.json"
+        # Sortie JSONL en surveillance : l'ajout incrémental évite de
+        # réécrire tout l'historique à chaque changement détecté
+        output_path = args.output or f"{Path(args.input_file).stem}_results.jsonl"
         processor.watch_file(args.input_file, output_path, args.interval)
         return
     
-    # Traitement normal
-    commits = processor.load_commits_json(args.input_file)
-    if not commits:
+    # Traitement normal, en flux : le parsing JSON et la classification
+    # se recouvrent, la RAM reste bornée par la fenêtre de traitement
+    commits = processor.iter_commits_json(args.input_file)
+    results = processor.process_commits(commits, skip_processed=False)
+
+    if not results:
         print("❌ Aucun commit à traiter")
         sys.exit(1)
     
-    # Traiter les commits
-    results = processor.process_commits(commits, skip_processed=False)
-    
     # Sauvegarder si demandé
     if args.output:
         processor.save_results(results, args.output)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+⚙️ Quantification Statique INT8 - Classificateur d'Humour
+=========================================================
+
+Script pour produire une version ONNX quantifiée statiquement (PTQ) du
+modèle EuroBERT. Contrairement à la quantification dynamique, les échelles
+d'activation sont calibrées une seule fois sur des messages de commit
+représentatifs, ce qui supprime leur recalcul à chaque inférence et permet
+l'INT8 sur les matmuls d'attention.
+
+Usage:
+    python quantize_model.py
+    python quantize_model.py --model eurobert_full --output model_int8.onnx
+
+Auteur: Assistant IA
+Version: 1.0
+"""
+
+import os
+import sys
+import argparse
+
+# Messages de calibration : mélange de commits drôles et neutres,
+# représentatifs du domaine (messages courts, multilingues)
+CALIBRATION_MESSAGES = [
+    "fix typo in README",
+    "update dependencies",
+    "wip",
+    "t",
+    "Initial commit",
+    "Merge branch 'master'",
+    "fix bug",
+    "refactor code",
+    "add tests",
+    "remove dead code",
+    "bump version to 1.0.1",
+    "update documentation",
+    "fix CI pipeline",
+    "cleanup",
+    "minor fixes",
+    "oops forgot to save",
+    "this should work now I swear",
+    "fixed the thing that broke the other thing",
+    "I have no idea why this works",
+    "commit de la dernière chance",
+    "ça marche chez moi",
+    "please work",
+    "final fix (for real this time)",
+    "removed print statements (sorry)",
+    "revert revert revert",
+    "fix fix of the fix",
+    "code ninja was here",
+    "il est 3h du matin envoyez de l'aide",
+    "push avant la deadline",
+    "j'ai cassé la prod",
+    "quick fix before demo",
+    "do not touch this file ever",
+    "magic, do not ask",
+    "added more cowbell",
+    "norme ok",
+    "exam final",
+    "rendu",
+    "correction exercice 01",
+    "add ft_strlen",
+    "gitignore update",
+    "refacto du parsing",
+    "feat: add login page",
+    "chore: update lockfile",
+    "docs: fix broken link",
+    "test: add unit tests for parser",
+    "style: reindent everything",
+    "perf: cache expensive computation",
+    "fix segfault when input is empty",
+    "handle edge case with empty commit message",
+    "why is this even a bug",
+]
+
+
+def build_calibration_reader(tokenizer, max_length=64):
+    """Construit un CalibrationDataReader sur les messages d'exemple"""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    encoded = tokenizer(
+        CALIBRATION_MESSAGES,
+        padding="max_length",
+        truncation=True,
+        max_length=max_length,
+        return_tensors="np"
+    )
+    samples = [
+        {name: encoded[name][i:i + 1] for name in encoded}
+        for i in range(len(CALIBRATION_MESSAGES))
+    ]
+
+    class CommitCalibrationReader(CalibrationDataReader):
+        """Itère une fois sur les messages de calibration tokenisés"""
+
+        def __init__(self):
+            self._iterator = iter(samples)
+
+        def get_next(self):
+            return next(self._iterator, None)
+
+    return CommitCalibrationReader()
+
+
+def export_onnx(model_path, onnx_path):
+    """Exporte le modèle PyTorch vers ONNX si nécessaire"""
+    if os.path.exists(onnx_path):
+        print(f"📂 Export ONNX existant : {onnx_path}")
+        return True
+
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        print("⚙️  Export ONNX du modèle...")
+        ort_model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True)
+        ort_model.save_pretrained(os.path.dirname(onnx_path) or ".")
+        return os.path.exists(onnx_path)
+    except Exception as e:
+        print(f"❌ Échec de l'export ONNX : {e}")
+        return False
+
+
+def quantize_static_int8(model_path, onnx_dir, output_name, max_length=64):
+    """Quantifie statiquement le modèle ONNX en INT8 avec calibration"""
+    try:
+        from transformers import AutoTokenizer
+        from onnxruntime.quantization import quantize_static, QuantFormat, QuantType
+    except ImportError as e:
+        print(f"❌ Dépendance manquante : {e}")
+        print("pip install onnxruntime optimum[onnxruntime]")
+        return False
+
+    onnx_input = os.path.join(onnx_dir, "model.onnx")
+    onnx_output = os.path.join(onnx_dir, output_name)
+
+    if not export_onnx(model_path, onnx_input):
+        return False
+
+    print("🔤 Chargement du tokenizer pour la calibration...")
+    tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+
+    print(f"📊 Calibration sur {len(CALIBRATION_MESSAGES)} messages de commit...")
+    reader = build_calibration_reader(tokenizer, max_length=max_length)
+
+    print("⚙️  Quantification statique INT8 (QDQ, per-channel)...")
+    quantize_static(
+        model_input=onnx_input,
+        model_output=onnx_output,
+        calibration_data_reader=reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+
+    print(f"✅ Modèle INT8 statique sauvegardé : {onnx_output}")
+    return True
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(
+        description="Quantification statique INT8 du classificateur d'humour"
+    )
+    parser.add_argument('--model', '-m', default='eurobert_full', help='Chemin local vers le modèle')
+    parser.add_argument('--output', '-o', default='model_int8.onnx', help='Nom du fichier ONNX quantifié')
+    parser.add_argument('--max-length', type=int, default=64, help='Longueur max des séquences de calibration')
+
+    args = parser.parse_args()
+
+    onnx_dir = f"{args.model}_onnx_int8"
+    os.makedirs(onnx_dir, exist_ok=True)
+
+    if not quantize_static_int8(args.model, onnx_dir, args.output, args.max_length):
+        return 1
+
+    print("\n💡 Le classificateur utilisera automatiquement ce modèle au prochain lancement")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
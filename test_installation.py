@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests d'Installation - Classificateur d'Humour pour Commits
+=============================================================
+
+Vérifie que l'installation est fonctionnelle : structure du modèle local,
+configuration du projet, compatibilité Hugging Face et chargement du
+modèle avec une inférence batchée représentative.
+
+Usage:
+    python test_installation.py             # Tous les tests
+    python test_installation.py --quick     # Sans chargement du modèle
+    python test_installation.py --verbose   # Affichage détaillé
+
+Auteur: Assistant IA
+Version: 1.0
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+from pathlib import Path
+
+# Fichiers attendus dans le répertoire du modèle fusionné
+REQUIRED_MODEL_FILES = [
+    "config.json",
+    "model.safetensors",
+    "tokenizer_config.json",
+]
+
+# Parseur JSON natif, repli stdlib (même convention que le reste du projet)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Champs attendus dans la configuration du projet
+REQUIRED_CONFIG_FIELDS = frozenset({
+    "project",
+    "model",
+    "requirements",
+    "scripts",
+})
+
+
+def test_model_structure(model_path="eurobert_full"):
+    """Vérifie la présence des fichiers du modèle local"""
+    print("\n📂 Test de la structure du modèle...")
+
+    # Un seul parcours scandir au lieu d'un exists() + stat() par fichier :
+    # les DirEntry portent déjà les métadonnées, 2N syscalls deviennent ~1
+    try:
+        entries = {entry.name: entry for entry in os.scandir(model_path)}
+    except FileNotFoundError:
+        print(f"⚠️  Modèle local absent ({model_path}) — il sera téléchargé au premier usage")
+        return True
+
+    missing = set(REQUIRED_MODEL_FILES) - entries.keys()
+    for name in REQUIRED_MODEL_FILES:
+        if name in entries:
+            size = entries[name].stat().st_size
+            print(f"   ✅ {name} ({size / 1024 / 1024:.1f} Mo)")
+        else:
+            print(f"   ❌ {name} manquant")
+
+    return not missing
+
+
+def test_config_validity(config_path="config.json"):
+    """Vérifie que la configuration du projet est valide"""
+    print("\n⚙️  Test de la configuration du projet...")
+
+    path = Path(config_path)
+    if not path.exists():
+        print(f"   ❌ {config_path} non trouvé")
+        return False
+
+    # Parse depuis un buffer en mémoire (read_bytes) plutôt qu'un flux :
+    # moins d'allocations, et orjson décode en C quand il est présent
+    try:
+        raw = path.read_bytes()
+        config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError as e:
+        print(f"   ❌ JSON invalide: {e}")
+        return False
+
+    # Validation par différence d'ensembles, sans test membre par membre
+    missing = REQUIRED_CONFIG_FIELDS - config.keys()
+    for field in sorted(REQUIRED_CONFIG_FIELDS & config.keys()):
+        print(f"   ✅ Champ '{field}' présent")
+    for field in sorted(missing):
+        print(f"   ❌ Champ '{field}' manquant")
+
+    return not missing
+
+
+@functools.lru_cache(maxsize=1)
+def _hf():
+    """
+    Importe huggingface_hub/transformers et construit le client HfApi une
+    seule fois — ces imports coûtent plusieurs secondes et le cache évite
+    de les repayer si un autre test en a besoin
+    """
+    import huggingface_hub
+    import transformers
+
+    return huggingface_hub, transformers, huggingface_hub.HfApi()
+
+
+def test_huggingface_compatibility():
+    """Vérifie que les bibliothèques Hugging Face sont importables"""
+    print("\n🤗 Test de compatibilité Hugging Face...")
+
+    try:
+        huggingface_hub, transformers, _ = _hf()
+        print(f"   ✅ huggingface_hub {huggingface_hub.__version__}")
+        print(f"   ✅ transformers {transformers.__version__}")
+        return True
+    except ImportError as e:
+        print(f"   ❌ Import impossible: {e}")
+        return False
+
+
+def test_model_loading(model_path="eurobert_full"):
+    """
+    Charge le modèle et exécute une inférence batchée représentative
+
+    Un warmup déclenche l'autotune cuDNN / la compilation JIT hors mesure,
+    puis un lot de 8 messages passe en un seul forward : les lancements de
+    kernels s'amortissent sur le lot et la latence mesurée par message
+    reflète le débit réel du chemin batché utilisé en production.
+    """
+    print("\n🤖 Test de chargement du modèle...")
+
+    try:
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    except ImportError as e:
+        print(f"   ❌ Dépendance manquante: {e}")
+        return False
+
+    if not os.path.exists(model_path):
+        print(f"   ⚠️  Modèle local absent ({model_path}) — test ignoré")
+        return True
+
+    try:
+        tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+
+        # low_cpu_mem_usage + use_safetensors : les poids sont mmappés
+        # zéro-copie depuis model.safetensors (pic RAM ~1x la taille du
+        # modèle au lieu de 2x), sans jamais passer par le désérialiseur
+        # pickle des .bin. Sur GPU : bf16 + device_map, moitié moins
+        # d'octets déplacés et flux direct vers le device
+        load_kwargs = {
+            'trust_remote_code': True,
+            'low_cpu_mem_usage': True,
+            'use_safetensors': True,
+        }
+        if torch.cuda.is_available():
+            load_kwargs.update(torch_dtype=torch.bfloat16, device_map='auto')
+        model = AutoModelForSequenceClassification.from_pretrained(model_path, **load_kwargs)
+        model.eval()
+
+        # Autotuning matériel : cuDNN sélectionne ses kernels une fois,
+        # TF32 active les tensor cores sur Ampère et plus récent
+        torch.backends.cudnn.benchmark = True
+        torch.backends.cuda.matmul.allow_tf32 = True
+
+        # Scripting TorchScript + optimize_for_inference : fusion des
+        # couches et suppression du dispatch Python par op. Module de test
+        # uniquement, jamais re-sérialisé ; les têtes HF non scriptables
+        # retombent sur le modèle eager
+        try:
+            model = torch.jit.optimize_for_inference(torch.jit.script(model))
+            print("   ⚡ TorchScript optimize_for_inference activé")
+        except Exception:
+            pass
+
+        # torch.compile (>= 2.1) : le graphe est capturé et fusionné par
+        # Inductor ; dynamic=True évite une recompilation par longueur de
+        # séquence. Le coût de compilation est absorbé par le warmup
+        try:
+            if tuple(int(x) for x in torch.__version__.split('.')[:2]) >= (2, 1):
+                model = torch.compile(model, mode="reduce-overhead", dynamic=True)
+                print("   ⚡ torch.compile activé")
+        except Exception:
+            pass
+
+        device = next(model.parameters()).device
+
+        # Warmup hors mesure (déclenche aussi la compilation Inductor)
+        with torch.inference_mode():
+            model(**tokenizer("warmup", return_tensors="pt").to(device))
+
+        # Lot fixe de messages représentatifs (courts, multilingues)
+        messages = [
+            "fix typo in README",
+            "wip",
+            "update dependencies",
+            "j'ai cassé la prod",
+            "final fix (for real this time)",
+            "add ft_strlen",
+            "Merge branch 'master'",
+            "please work",
+        ]
+        inputs = tokenizer(messages, return_tensors="pt", truncation=True, padding=True).to(device)
+
+        start = time.perf_counter()
+        # inference_mode : contrairement à no_grad, pas de compteurs de
+        # version autograd ni de métadonnées de vues allouées
+        with torch.inference_mode():
+            logits = model(**inputs).logits
+        elapsed = time.perf_counter() - start
+
+        probs = logits.softmax(-1)
+        print(f"   ✅ Forward batché {tuple(probs.shape)} en {elapsed * 1000:.1f} ms "
+              f"({elapsed / len(messages) * 1000:.2f} ms/message)")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ Échec du chargement du modèle: {e}")
+        return False
+
+
+def main(argv=None):
+    """Fonction principale — retourne 0 si tous les tests passent"""
+    parser = argparse.ArgumentParser(description="Tests d'installation du classificateur d'humour")
+    parser.add_argument('--quick', action='store_true', help="Tests rapides (sans chargement du modèle)")
+    parser.add_argument('--verbose', action='store_true', help="Affichage détaillé")
+
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🧪 TESTS D'INSTALLATION - CLASSIFICATEUR D'HUMOUR")
+    print("=" * 60)
+
+    if args.verbose:
+        print(f"🐍 Python: {'%d.%d.%d' % sys.version_info[:3]}")
+        print(f"📁 Répertoire: {os.getcwd()}")
+
+    tests = [
+        ("Structure du modèle", test_model_structure),
+        ("Configuration", test_config_validity),
+        ("Compatibilité Hugging Face", test_huggingface_compatibility),
+    ]
+    if not args.quick:
+        tests.append(("Chargement du modèle", test_model_loading))
+
+    failures = []
+    for name, test in tests:
+        if not test():
+            failures.append(name)
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ {len(failures)} test(s) en échec: {', '.join(failures)}")
+        print("💡 Lancez 'python install.py' pour réparer l'installation")
+        return 1
+
+    print("🎉 Tous les tests sont passés !")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,11 +24,40 @@ import sys
 import json
 import subprocess
 import argparse
+import time
+import calendar
 import requests
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+# Parseur JSON natif pour les réponses HTTP : response.json() passe par le
+# module json pur Python ; orjson décode les mêmes octets 3-10x plus vite
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Cache disque des métadonnées PyPI : la dernière version d'un package ne
+# change pas d'heure en heure, inutile de payer N handshakes TLS par run
+CACHE_DIR = Path.home() / ".cache" / "commit-humor-classifier"
+PYPI_CACHE_FILE = CACHE_DIR / "pypi.json"
+PYPI_CACHE_TTL = 6 * 3600  # secondes
+
+# ETags Hugging Face par dépôt : permet au serveur de répondre 304 au lieu
+# de renvoyer (et nous faire parser) les métadonnées complètes du modèle
+HF_ETAG_FILE = CACHE_DIR / "hf_etag.json"
+
+# Emojis de statut : constante de module, pas un dict reconstruit par appel
+_EMOJI = {
+    "INFO": "ℹ️",
+    "SUCCESS": "✅",
+    "WARNING": "⚠️",
+    "ERROR": "❌",
+    "WORKING": "🔄",
+    "UPDATE": "🆙"
+}
+
 class UpdateManager:
     """Gestionnaire de mise à jour pour le classificateur d'humeur."""
     
@@ -46,6 +75,12 @@ class UpdateManager:
             "pypi_api": "https://pypi.org/pypi",
             "github_releases": "https://api.github.com/repos"
         }
+
+        # Session HTTP partagée : keepalive + pool de connexions, les
+        # handshakes TLS vers pypi.org/huggingface.co ne se paient qu'une fois
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
     
     def load_config(self) -> Dict:
         """Charge la configuration du projet."""
@@ -78,16 +113,7 @@ class UpdateManager:
     
     def print_status(self, message: str, status: str = "INFO") -> None:
         """Affiche un message de statut."""
-        emoji_map = {
-            "INFO": "ℹ️",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️",
-            "ERROR": "❌",
-            "WORKING": "🔄",
-            "UPDATE": "🆙"
-        }
-        emoji = emoji_map.get(status, "📝")
-        print(f"{emoji} {message}")
+        print(f"{_EMOJI.get(status, '📝')} {message}")
     
     def run_command(self, command: List[str], description: str) -> Tuple[bool, str]:
         """Exécute une commande et retourne le résultat."""
@@ -111,58 +137,118 @@ class UpdateManager:
             self.print_status(f"Erreur lors de {description}: {e}", "ERROR")
             return False, str(e)
     
+    @staticmethod
+    def _parse_json(response) -> Dict:
+        """Décode une réponse HTTP JSON (orjson si disponible)."""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def _load_pypi_cache(self) -> Dict:
+        """Charge le cache disque des versions PyPI (une seule lecture)."""
+        try:
+            return json.loads(PYPI_CACHE_FILE.read_text())
+        except Exception:
+            return {}
+
+    def _save_pypi_cache(self, cache: Dict) -> None:
+        """Persiste le cache des versions PyPI."""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            PYPI_CACHE_FILE.write_text(json.dumps(cache))
+        except Exception as e:
+            self.print_status(f"Cache PyPI non sauvegardé: {e}", "WARNING")
+
+    def _pypi_latest_version(self, package_name: str, cache: Dict) -> Optional[str]:
+        """
+        Retourne la dernière version PyPI d'un package.
+
+        Les entrées plus jeunes que PYPI_CACHE_TTL sont servies depuis le
+        cache disque sans toucher au réseau.
+        """
+        entry = cache.get(package_name)
+        if entry and time.time() - entry.get('ts', 0) < PYPI_CACHE_TTL:
+            return entry['version']
+
+        try:
+            response = self.session.get(f"https://pypi.org/pypi/{package_name}/json", timeout=10)
+            if response.status_code == 200:
+                latest_version = self._parse_json(response)['info']['version']
+                cache[package_name] = {'version': latest_version, 'ts': time.time()}
+                return latest_version
+        except requests.RequestException:
+            pass
+        return None
+
+    @staticmethod
+    def _requirement_name(req: str) -> str:
+        """Extrait le nom d'un package d'une ligne de requirements."""
+        try:
+            from packaging.requirements import Requirement
+            return Requirement(req).name
+        except Exception:
+            # Repli sur l'heuristique historique si packaging est absent
+            return req.split('>=')[0].split('==')[0].strip()
+
     def check_python_packages_updates(self) -> Dict[str, Dict]:
         """Vérifie les mises à jour disponibles pour les packages Python."""
         self.print_status("Vérification des mises à jour des packages Python...", "WORKING")
-        
+
         updates_available = {}
-        
+
         if not self.requirements_file.exists():
             self.print_status("Fichier requirements.txt non trouvé", "WARNING")
             return updates_available
-        
+
         # Lire les requirements
         with open(self.requirements_file, 'r') as f:
             requirements = f.read().splitlines()
-        
-        for req in requirements:
-            if req.strip() and not req.startswith('#'):
-                package_name = req.split('>=')[0].split('==')[0].strip()
-                
-                try:
-                    # Obtenir la version installée
-                    success, current_version = self.run_command(
-                        [sys.executable, '-c', f'import {package_name}; print({package_name}.__version__)'],
-                        f"Vérification de {package_name}"
-                    )
-                    
-                    if success:
-                        # Vérifier la dernière version sur PyPI
-                        try:
-                            response = requests.get(f"https://pypi.org/pypi/{package_name}/json", timeout=10)
-                            if response.status_code == 200:
-                                data = response.json()
-                                latest_version = data['info']['version']
-                                
-                                if current_version != latest_version:
-                                    updates_available[package_name] = {
-                                        'current': current_version,
-                                        'latest': latest_version,
-                                        'update_available': True
-                                    }
-                                else:
-                                    updates_available[package_name] = {
-                                        'current': current_version,
-                                        'latest': latest_version,
-                                        'update_available': False
-                                    }
-                        except requests.RequestException:
-                            self.print_status(f"Impossible de vérifier {package_name} sur PyPI", "WARNING")
-                            
-                except Exception:
-                    self.print_status(f"Package {package_name} non installé", "WARNING")
-        
+
+        pypi_cache = self._load_pypi_cache()
+        package_names = [self._requirement_name(req) for req in requirements
+                         if req.strip() and not req.startswith('#')]
+
+        # Fan-out sur un pool de threads : les requêtes PyPI sont liées au
+        # réseau, leur latence se recouvre au lieu de s'additionner
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=min(16, max(1, len(package_names)))) as executor:
+            futures = {
+                executor.submit(self._check_one_package, name, pypi_cache): name
+                for name in package_names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                info = future.result()
+                if info is not None:
+                    updates_available[name] = info
+
+        self._save_pypi_cache(pypi_cache)
         return updates_available
+
+    def _check_one_package(self, package_name: str, pypi_cache: Dict) -> Optional[Dict]:
+        """Vérifie un package (version installée + dernière version PyPI)."""
+        # importlib.metadata lit le dist-info installé sans importer le
+        # package : pas de fork d'interpréteur ni d'import de torch (~300 Mo)
+        # juste pour lire un numéro de version
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            current_version = version(package_name)
+        except PackageNotFoundError:
+            self.print_status(f"Package {package_name} non installé", "WARNING")
+            return None
+
+        # Vérifier la dernière version sur PyPI (cache 6h)
+        latest_version = self._pypi_latest_version(package_name, pypi_cache)
+        if latest_version is not None:
+            return {
+                'current': current_version,
+                'latest': latest_version,
+                'update_available': current_version != latest_version
+            }
+        self.print_status(f"Impossible de vérifier {package_name} sur PyPI", "WARNING")
+        return None
     
     def check_model_updates(self) -> Dict[str, any]:
         """Vérifie les mises à jour du modèle sur Hugging Face."""
@@ -180,20 +266,49 @@ class UpdateManager:
                 self.print_status("Repository Hugging Face non configuré", "WARNING")
                 return model_info
             
-            # Vérifier les informations du modèle
-            response = requests.get(f"https://huggingface.co/api/models/{repo_id}", timeout=10)
+            # Requête conditionnelle : avec l'ETag de la dernière réponse,
+            # le serveur répond 304 quand rien n'a changé côté Hub
+            try:
+                etags = json.loads(HF_ETAG_FILE.read_text())
+            except Exception:
+                etags = {}
+
+            headers = {}
+            # Pas de requête conditionnelle si le modèle local manque : un
+            # 304 signifierait à tort "rien à faire"
+            if repo_id in etags and (self.project_root / "eurobert_full").exists():
+                headers["If-None-Match"] = etags[repo_id]
+
+            response = self.session.get(f"https://huggingface.co/api/models/{repo_id}",
+                                        headers=headers, timeout=10)
+
+            if response.status_code == 304:
+                self.print_status("Modèle à jour (304 Not Modified)", "SUCCESS")
+                return model_info
+
             if response.status_code == 200:
-                data = response.json()
+                etag = response.headers.get("ETag")
+                if etag:
+                    etags[repo_id] = etag
+                    try:
+                        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                        HF_ETAG_FILE.write_text(json.dumps(etags))
+                    except Exception:
+                        pass
+                data = self._parse_json(response)
                 last_modified = data.get('lastModified', '')
                 
                 # Vérifier si le modèle local existe
                 local_model_path = self.project_root / "eurobert_full"
                 if local_model_path.exists():
-                    # Comparer les dates de modification
-                    local_mtime = datetime.fromtimestamp(local_model_path.stat().st_mtime)
-                    remote_mtime = datetime.fromisoformat(last_modified.replace('Z', '+00:00'))
-                    
-                    if remote_mtime > local_mtime:
+                    # Comparaison en secondes epoch des deux côtés : le Hub
+                    # renvoie un timestamp UTC, st_mtime est déjà en UTC —
+                    # aucun objet datetime naïf/aware à réconcilier
+                    local_epoch = int(local_model_path.stat().st_mtime)
+                    remote_epoch = calendar.timegm(time.strptime(
+                        last_modified.split('.')[0], '%Y-%m-%dT%H:%M:%S'))
+
+                    if remote_epoch > local_epoch:
                         model_info['update_available'] = True
                         model_info['latest_version'] = last_modified
                         self.print_status("Mise à jour du modèle disponible", "UPDATE")
@@ -213,30 +328,191 @@ class UpdateManager:
         
         return model_info
     
+    def _dependency_state_hash(self) -> str:
+        """Empreinte de requirements.txt + l'ensemble des packages installés."""
+        import hashlib
+        from importlib.metadata import distributions
+
+        installed = json.dumps(sorted(
+            (str(d.metadata['Name']), d.version) for d in distributions()
+        ))
+        return hashlib.blake2b(
+            self.requirements_file.read_bytes() + installed.encode()
+        ).hexdigest()
+
+    def check_all(self) -> Tuple[Dict[str, Dict], Dict[str, any]]:
+        """
+        Vérifie packages et modèle en une passe concurrente.
+
+        Avec aiohttp, toutes les requêtes PyPI partent sur une même boucle
+        d'événements et le check Hugging Face tourne en parallèle : la
+        latence totale tend vers max(RTT) au lieu de sum(RTT). Sans
+        aiohttp, repli sur les deux vérifications synchrones existantes.
+        """
+        try:
+            import aiohttp  # noqa: F401
+            import asyncio
+        except ImportError:
+            return self.check_python_packages_updates(), self.check_model_updates()
+
+        return asyncio.run(self._check_all_async())
+
+    async def _check_all_async(self):
+        """Cœur asynchrone de check_all."""
+        import aiohttp
+        import asyncio
+        from importlib.metadata import version, PackageNotFoundError
+
+        self.print_status("Vérification des mises à jour (mode asynchrone)...", "WORKING")
+
+        package_names = []
+        if self.requirements_file.exists():
+            for req in self.requirements_file.read_text().splitlines():
+                if req.strip() and not req.startswith('#'):
+                    package_names.append(self._requirement_name(req))
+
+        pypi_cache = self._load_pypi_cache()
+
+        async def pypi_latest(session, name):
+            entry = pypi_cache.get(name)
+            if entry and time.time() - entry.get('ts', 0) < PYPI_CACHE_TTL:
+                return name, entry['version']
+            try:
+                async with session.get(f"https://pypi.org/pypi/{name}/json") as resp:
+                    if resp.status == 200:
+                        raw = await resp.read()
+                        latest = (orjson.loads(raw) if orjson is not None
+                                  else json.loads(raw))['info']['version']
+                        pypi_cache[name] = {'version': latest, 'ts': time.time()}
+                        return name, latest
+            except Exception:
+                pass
+            return name, None
+
+        loop = asyncio.get_running_loop()
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                # Le check modèle (logique ETag synchrone) dans un thread,
+                # recouvert par les requêtes PyPI de la boucle d'événements
+                loop.run_in_executor(None, self.check_model_updates),
+                *(pypi_latest(session, name) for name in package_names),
+                return_exceptions=True
+            )
+
+        self._save_pypi_cache(pypi_cache)
+
+        model_info = results[0] if not isinstance(results[0], Exception) else {
+            'update_available': False, 'current_version': 'local', 'latest_version': 'unknown'
+        }
+
+        updates_available = {}
+        for item in results[1:]:
+            if isinstance(item, Exception):
+                continue
+            name, latest = item
+            if latest is None:
+                self.print_status(f"Impossible de vérifier {name} sur PyPI", "WARNING")
+                continue
+            try:
+                current = version(name)
+            except PackageNotFoundError:
+                self.print_status(f"Package {name} non installé", "WARNING")
+                continue
+            updates_available[name] = {
+                'current': current,
+                'latest': latest,
+                'update_available': current != latest
+            }
+
+        return updates_available, model_info
+
     def update_dependencies(self, force: bool = False) -> bool:
         """Met à jour les dépendances Python."""
         self.print_status("Mise à jour des dépendances...", "WORKING")
-        
+
         if not self.requirements_file.exists():
             self.print_status("Fichier requirements.txt non trouvé", "ERROR")
             return False
-        
-        # Commande de mise à jour
-        update_command = [
-            sys.executable, '-m', 'pip', 'install', '--upgrade',
-            '-r', str(self.requirements_file)
-        ]
-        
+
+        # Lignes de requirements indexées par nom de package, pour pouvoir
+        # passer à pip le spécificateur d'origine (contraintes de version)
+        requirements = [req.strip() for req in self.requirements_file.read_text().splitlines()
+                        if req.strip() and not req.startswith('#')]
+        spec_by_name = {self._requirement_name(req): req for req in requirements}
+
+        state_file = self.project_root / '.update_state.json'
+        if force:
+            targets = ['-r', str(self.requirements_file)]
+        else:
+            # Diff-set : seuls les packages absents localement ou dont PyPI
+            # annonce une nouvelle version (vérification avec cache 6h)
+            # partent à pip, au lieu de re-résoudre tout requirements.txt
+            from importlib.metadata import version, PackageNotFoundError
+
+            updates = self.check_python_packages_updates()
+            targets = []
+            for name, spec in spec_by_name.items():
+                try:
+                    version(name)
+                except PackageNotFoundError:
+                    targets.append(spec)
+                    continue
+                if updates.get(name, {}).get('update_available'):
+                    targets.append(spec)
+
+            if not targets:
+                # Rien d'absent, rien d'obsolète sur PyPI. Le hash local ne
+                # suffit pas comme seul critère (il ne bouge pas quand PyPI
+                # publie une version) mais il détecte la dérive inverse :
+                # requirements.txt ou l'environnement modifiés depuis la
+                # dernière réconciliation → une passe complète s'impose
+                try:
+                    state = json.loads(state_file.read_text())
+                except Exception:
+                    state = {}
+                if state.get('dependencies_hash') == self._dependency_state_hash():
+                    self.print_status("Dépendances à jour (aucune nouvelle version PyPI)", "SUCCESS")
+                    return True
+                targets = ['-r', str(self.requirements_file)]
+            else:
+                self.print_status(f"À mettre à jour : {', '.join(sorted(targets))}", "UPDATE")
+
+        # uv quand il est disponible : résolveur Rust parallèle et
+        # cache-aware, 10-100x plus rapide que pip sur cache chaud
+        import shutil
+
+        if shutil.which('uv'):
+            update_command = [
+                'uv', 'pip', 'install', '--upgrade', *targets,
+                '--python', sys.executable
+            ]
+        else:
+            update_command = [
+                sys.executable, '-m', 'pip', 'install', '--upgrade', *targets
+            ]
+            if not force:
+                # Pas de précompilation .pyc : les modules la feront à la
+                # demande, autant d'écritures disque en moins
+                update_command.append('--no-compile')
+
         if force:
             update_command.append('--force-reinstall')
-        
+
         success, output = self.run_command(update_command, "Mise à jour des dépendances")
-        
+
         if success:
             self.print_status("Dépendances mises à jour avec succès", "SUCCESS")
+            # Mémoriser l'état post-installation pour le court-circuit
+            try:
+                state_file.write_text(json.dumps(
+                    {'dependencies_hash': self._dependency_state_hash()}
+                ))
+            except Exception:
+                pass
         else:
             self.print_status(f"Échec de la mise à jour des dépendances: {output}", "ERROR")
-        
+
         return success
     
     def update_model(self, force: bool = False) -> bool:
@@ -244,51 +520,97 @@ class UpdateManager:
         self.print_status("Mise à jour du modèle...", "WORKING")
         
         try:
-            # Utiliser le script de classification pour télécharger le modèle
-            classifier_script = self.project_root / "commit_humor_classifier.py"
-            
-            if not classifier_script.exists():
-                self.print_status("Script de classification non trouvé", "ERROR")
+            repo_id = self.config.get('model', {}).get('huggingface_repo', '')
+            if not repo_id:
+                self.print_status("Repository Hugging Face non configuré", "ERROR")
                 return False
-            
-            # Supprimer le modèle local si force est activé
+
+            # Supprimer le modèle local si force est activé. Le rename est
+            # atomique et instantané ; la suppression effective (des Go de
+            # shards, lente) se fait en arrière-plan pendant que le nouveau
+            # téléchargement démarre immédiatement
             if force:
                 local_model_path = self.project_root / "eurobert_full"
                 if local_model_path.exists():
                     import shutil
-                    shutil.rmtree(local_model_path)
-                    self.print_status("Modèle local supprimé", "INFO")
+                    import threading
+                    import uuid
+
+                    trash = local_model_path.with_name(
+                        f"{local_model_path.name}.trash.{uuid.uuid4().hex}"
+                    )
+                    local_model_path.rename(trash)
+                    threading.Thread(
+                        target=shutil.rmtree, args=(trash,),
+                        kwargs={'ignore_errors': True}, daemon=True
+                    ).start()
+                    self.print_status("Modèle local écarté (suppression en arrière-plan)", "INFO")
             
-            # Télécharger le modèle
-            success, output = self.run_command(
-                [sys.executable, str(classifier_script), '--download-only'],
-                "Téléchargement du modèle"
+            # Téléchargement direct via snapshot_download : pas de
+            # sous-processus Python (~2-3 s d'imports torch/transformers
+            # économisés) et les shards sont récupérés en parallèle
+            from huggingface_hub import snapshot_download
+
+            snapshot_download(
+                repo_id=repo_id,
+                local_dir=str(self.project_root / "eurobert_full"),
+                max_workers=8,
             )
-            
-            if success:
-                self.print_status("Modèle mis à jour avec succès", "SUCCESS")
-            else:
-                self.print_status(f"Échec de la mise à jour du modèle: {output}", "ERROR")
-            
-            return success
-            
+            self.print_status("Modèle mis à jour avec succès", "SUCCESS")
+            return True
+
+        except ImportError as e:
+            self.print_status(f"huggingface_hub non disponible: {e}", "ERROR")
+            return False
         except Exception as e:
             self.print_status(f"Erreur lors de la mise à jour du modèle: {e}", "ERROR")
             return False
     
+    @staticmethod
+    def _fast_copy(src: Path, dst: Path) -> None:
+        """
+        Copie un fichier en préférant le clonage copy-on-write.
+
+        Sur Btrfs/XFS (ioctl FICLONE) et APFS (clonefile), le clone est une
+        opération de métadonnées O(1) : aucun octet recopié, pas d'espace
+        disque supplémentaire. Repli sur shutil.copy2 ailleurs.
+        """
+        import shutil
+
+        if hasattr(os, 'clonefile'):  # macOS
+            try:
+                os.clonefile(str(src), str(dst))
+                return
+            except OSError:
+                pass
+        elif sys.platform.startswith('linux'):
+            try:
+                import fcntl
+                FICLONE = 0x40049409
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, dst)
+                return
+            except OSError:
+                # Filesystem sans reflink (ext4...) : copie classique
+                try:
+                    dst.unlink()
+                except OSError:
+                    pass
+
+        shutil.copy2(src, dst)
+
     def create_backup(self) -> bool:
         """Crée une sauvegarde avant la mise à jour."""
         self.print_status("Création d'une sauvegarde...", "WORKING")
-        
+
         try:
-            import shutil
-            
             backup_dir = self.project_root / "backup"
             backup_dir.mkdir(exist_ok=True)
-            
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = backup_dir / f"backup_{timestamp}"
-            
+
             # Sauvegarder les fichiers importants
             important_files = [
                 "commit_humor_classifier.py",
@@ -296,17 +618,22 @@ class UpdateManager:
                 "config.json",
                 "requirements.txt"
             ]
-            
+
             backup_path.mkdir(exist_ok=True)
-            
-            for file_name in important_files:
-                file_path = self.project_root / file_name
-                if file_path.exists():
-                    shutil.copy2(file_path, backup_path / file_name)
-            
+
+            # Copies en parallèle : les replis sans reflink recouvrent
+            # ainsi leurs entrées/sorties au lieu de les sérialiser
+            from concurrent.futures import ThreadPoolExecutor
+
+            to_copy = [(self.project_root / name, backup_path / name)
+                       for name in important_files
+                       if (self.project_root / name).exists()]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda pair: self._fast_copy(*pair), to_copy))
+
             self.print_status(f"Sauvegarde créée: {backup_path}", "SUCCESS")
             return True
-            
+
         except Exception as e:
             self.print_status(f"Erreur lors de la sauvegarde: {e}", "ERROR")
             return False
@@ -316,21 +643,47 @@ class UpdateManager:
         self.print_status("Exécution des tests post-mise à jour...", "WORKING")
         
         test_script = self.project_root / "test_installation.py"
-        
+
         if not test_script.exists():
             self.print_status("Script de test non trouvé", "WARNING")
             return True  # Pas d'échec si pas de tests
-        
-        success, output = self.run_command(
-            [sys.executable, str(test_script), '--quick'],
-            "Tests post-mise à jour"
-        )
-        
+
+        # Appel en-processus : pas de second démarrage d'interpréteur ni de
+        # ré-import de torch/transformers juste pour relancer les tests
+        try:
+            import io
+            import contextlib
+            import importlib
+
+            sys.path.insert(0, str(self.project_root))
+            try:
+                test_module = importlib.import_module('test_installation')
+            finally:
+                sys.path.pop(0)
+
+            buffer = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(buffer):
+                    returncode = test_module.main(['--quick'])
+            except SystemExit as e:
+                returncode = e.code or 0
+
+            success = returncode == 0
+        except Exception:
+            # Repli : exécution en sous-processus comme avant
+            success, output = self.run_command(
+                [sys.executable, str(test_script), '--quick'],
+                "Tests post-mise à jour"
+            )
+            if not success:
+                self.print_status(f"Échec des tests: {output}", "ERROR")
+            return success
+
         if success:
             self.print_status("Tests réussis", "SUCCESS")
         else:
-            self.print_status(f"Échec des tests: {output}", "ERROR")
-        
+            self.print_status(f"Échec des tests:\n{buffer.getvalue()}", "ERROR")
+
         return success
 
 def main():
@@ -356,16 +709,14 @@ def main():
         if args.check:
             print("\n📋 Vérification des mises à jour disponibles...")
             
-            # Vérifier les packages
-            package_updates = manager.check_python_packages_updates()
+            # Packages et modèle vérifiés en une passe concurrente
+            package_updates, model_updates = manager.check_all()
             if package_updates:
                 print("\n📦 Mises à jour de packages disponibles:")
                 for package, info in package_updates.items():
                     if info['update_available']:
                         print(f"   • {package}: {info['current']} → {info['latest']}")
-            
-            # Vérifier le modèle
-            model_updates = manager.check_model_updates()
+
             if model_updates['update_available']:
                 print("\n🤖 Mise à jour du modèle disponible")
             
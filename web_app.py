@@ -9,27 +9,60 @@ affiche ceux jugés drôles par le modèle existant dans une interface Web.
 
 import os
 import json
+import bisect
 import threading
 import time
 import logging
-from hashlib import md5
+from collections import OrderedDict
+from hashlib import blake2b
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, jsonify, render_template, request
+
+# Avant l'import du classificateur : autorise le tokenizer Rust à encoder
+# les lots sur tous les cœurs (rayon). Sans fork après usage du tokenizer
+# dans ce process, le warning HF ne s'applique pas.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
 from commit_humor_classifier import CommitHumorClassifier
 
+# Sérialisation JSON native : orjson encode en C avec SIMD, sans passage
+# str→bytes intermédiaire. Repli sur jsonify (stdlib) s'il est absent.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parse en flux du tableau de commits : ijson produit les éléments au fil
+# de la lecture sans matérialiser toute la liste en RAM
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 app = Flask(__name__)
 
-# Liste des commits drôles déjà détectés
-FUNNY_COMMITS: List[Dict] = []
-# Ensemble des IDs de commits déjà traités
-PROCESSED_IDS = set()
+# Commits drôles maintenus triés à l'insertion (plus récent d'abord) via
+# bisect.insort sur des tuples (-date_ts, id, payload) : l'insertion coûte
+# O(log N + décalage) et la lecture un simple slice, au lieu d'un
+# sorted() O(N log N) par requête HTTP
+FUNNY_COMMITS: List[Tuple[float, str, Dict]] = []
+# Nombre maximum de commits renvoyés par /funny_commits (param ?limit=)
+DEFAULT_LIMIT = int(os.environ.get("FUNNY_LIMIT", "500"))
+# IDs de commits déjà traités, en LRU borné : un set nu croît sans limite
+# sur un serveur qui tourne longtemps. L'OrderedDict évince les ids les
+# plus anciens au-delà du plafond — au pire un vieux commit est reclassifié
+PROCESSED_IDS: "OrderedDict[str, None]" = OrderedDict()
+MAX_PROCESSED_IDS = int(os.environ.get("MAX_PROCESSED_IDS", "100000"))
+# Plafond du nombre de commits drôles conservés en mémoire
+MAX_FUNNY_COMMITS = int(os.environ.get("MAX_FUNNY_COMMITS", "5000"))
 # Chemin du fichier JSON à surveiller
 JSON_FILE = os.environ.get("COMMITS_JSON", "commits.json")
 # Intervalle de rafraîchissement (secondes)
 UPDATE_INTERVAL = 60
+# Taille des lots envoyés au modèle (amortit tokenisation et lancements de kernels)
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "32"))
 # Mode debug activé/désactivé via variable d'environnement
 DEBUG_MODE = os.environ.get("DEBUG_PREDICTIONS", "false").lower() == "true"
 
@@ -49,77 +82,366 @@ if DEBUG_MODE:
         logger.addHandler(handler)
         logger.propagate = False  # Éviter la duplication avec le logger root
 
-# Initialisation du classificateur
-classifier = CommitHumorClassifier(seuil=0.65)
-classifier.load_model()
+# Paramètres du classificateur. Le classificateur choisit déjà FP16 sur
+# GPU / int8 dynamique sur CPU et exécute sous inference_mode ; fast=True
+# ajoute torch.compile (graphe spécialisé + warmup payé une fois au
+# démarrage, pas sur les requêtes). WEB_DTYPE permet de forcer une
+# précision (ex: bfloat16 sur CPU AVX512-BF16).
+WEB_DTYPE = os.environ.get("WEB_DTYPE") or None
+WEB_FAST = os.environ.get("WEB_FAST", "true").lower() == "true"
+# Formes figées : les messages de commit ont une distribution de longueurs
+# serrée, padder systématiquement à max_length permet un graphe compilé
+# unique (dynamic=False) sans gardes ni recompilations
+WEB_STATIC_SHAPES = os.environ.get("WEB_STATIC_SHAPES", "false").lower() == "true"
+# "process" : l'inférence vit dans un process dédié et ne partage pas le
+# GIL avec les handlers Flask ; "thread" : tout dans ce process
+INFERENCE_MODE = os.environ.get("INFERENCE_MODE", "process" if hasattr(os, "fork") else "thread")
+
+# Classificateur instancié paresseusement, uniquement dans le worker : le
+# process Flask n'héberge jamais le modèle en mode process
+classifier = None
 
 # Message de confirmation du mode debug
 if DEBUG_MODE and logger:
     logger.info("🐛 Mode debug activé - Les prédictions seront loggées")
 
 
+def _get_classifier() -> CommitHumorClassifier:
+    """Instancie et charge le classificateur au premier usage."""
+    global classifier
+    if classifier is None:
+        classifier = CommitHumorClassifier(seuil=0.65, batch_size=BATCH_SIZE,
+                                           dtype=WEB_DTYPE, fast=WEB_FAST,
+                                           static_shapes=WEB_STATIC_SHAPES)
+        classifier.load_model()
+    return classifier
+
+
+def _seen(cid: str) -> bool:
+    """Teste et marque un id de commit dans le LRU borné (O(1))."""
+    if cid in PROCESSED_IDS:
+        PROCESSED_IDS.move_to_end(cid)
+        return True
+    PROCESSED_IDS[cid] = None
+    if len(PROCESSED_IDS) > MAX_PROCESSED_IDS:
+        PROCESSED_IDS.popitem(last=False)
+    return False
+
+
 def get_commit_id(commit: Dict) -> str:
-    """Retourne un identifiant unique pour le commit."""
+    """Retourne un identifiant unique pour le commit.
+
+    blake2b tronqué à 8 octets : identifiant non cryptographique plus
+    rapide que md5 et deux fois plus court (même schéma que
+    process_commits_json). Le séparateur \\0 évite les collisions entre
+    message et date concaténés.
+    """
     if "sha" in commit:
         return commit["sha"]
-    content = f"{commit.get('message', '')}{commit.get('author', {}).get('date', '')}"
-    return md5(content.encode()).hexdigest()
+    content = f"{commit.get('message', '')}\0{commit.get('author', {}).get('date', '')}"
+    return blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+# Signature (st_mtime_ns, st_size) du dernier parse réussi : tant qu'elle
+# ne change pas, inutile de relire et re-parser tout le fichier
+_last_stat = (0, 0)
+
+
+def _file_signature():
+    """Signature stat du fichier de commits, ou None s'il est absent."""
+    try:
+        s = os.stat(JSON_FILE)
+    except OSError:
+        return None
+    return (s.st_mtime_ns, s.st_size)
 
 
 def read_commits() -> List[Dict]:
-    """Lit le fichier JSON et renvoie la liste de commits."""
-    if not os.path.exists(JSON_FILE):
+    """Lit le fichier JSON et renvoie la liste de commits.
+
+    Un seul appel stat() court-circuite le cycle quand le fichier n'a pas
+    bougé : le coût en régime permanent devient O(1) au lieu d'un parse
+    O(taille du fichier) à chaque passage.
+    """
+    global _last_stat
+    sig = _file_signature()
+    if sig is None or sig == _last_stat:
         return []
     try:
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            commits = json.load(f)
-            if isinstance(commits, list):
-                return commits
+        # Lecture binaire avec gros buffer (1 Mio) : moins de syscalls et
+        # pas de décodage UTF-8 ligne à ligne du mode texte ; orjson parse
+        # directement les octets bruts quand il est présent
+        with open(JSON_FILE, "rb", buffering=1 << 20) as f:
+            data = f.read()
+        commits = orjson.loads(data) if orjson is not None else json.loads(data)
+        if isinstance(commits, list):
+            _last_stat = sig
+            return commits
     except Exception:
         pass
     return []
 
 
-def update_commits_loop() -> None:
-    """Boucle de mise à jour périodique."""
-    while True:
-        commits = read_commits()
-        for commit in commits:
-            cid = get_commit_id(commit)
-            if cid in PROCESSED_IDS:
-                continue
-            message = commit.get("message", "").strip()
-            if not message:
-                PROCESSED_IDS.add(cid)
-                continue
-            try:
-                result = classifier.predict(message)
-                # Log de debug sur une seule ligne
-                if DEBUG_MODE and logger:
-                    status = "FUNNY" if result["is_funny"] else "NORMAL"
-                    logger.info(f"PREDICTION: [{status}] P={result['probability']:.3f} | {message[:80]}{'...' if len(message) > 80 else ''}")
-            except Exception as e:
+def iter_commits():
+    """Itère sur les commits sans matérialiser toute la liste.
+
+    Avec ijson, les éléments du tableau sont produits au fil du parse :
+    les commits déjà connus sont écartés un par un par la passe de
+    déduplication et seuls les nouveaux survivent en mémoire. Repli sur
+    la lecture complète quand ijson est absent.
+    """
+    global _last_stat
+    if ijson is None:
+        yield from read_commits()
+        return
+    sig = _file_signature()
+    if sig is None or sig == _last_stat:
+        return
+    try:
+        with open(JSON_FILE, "rb", buffering=1 << 20) as f:
+            yield from ijson.items(f, "item")
+        _last_stat = sig
+    except Exception:
+        # Fichier invalide ou en cours d'écriture : retenté au prochain réveil
+        pass
+
+
+# File de résultats vers le process Flask (renseignée en mode process)
+_RESULT_QUEUE = None
+
+# Vue immuable servie aux handlers HTTP : le rebind d'un nom de module est
+# atomique sous le GIL, les lecteurs voient donc toujours un tuple complet
+# et cohérent, jamais une liste en cours de mutation
+_FUNNY_SNAPSHOT: Tuple[Dict, ...] = ()
+
+
+def _refresh_snapshot() -> None:
+    """Reconstruit et rebind atomiquement la vue immuable des lecteurs."""
+    global _FUNNY_SNAPSHOT
+    _FUNNY_SNAPSHOT = tuple(payload for _, _, payload in FUNNY_COMMITS)
+
+
+# Ids déjà présents dans FUNNY_COMMITS : un commit réévalué après éviction
+# de PROCESSED_IDS (LRU borné) ne doit pas être réinséré en doublon
+_PUBLISHED_IDS = set()
+
+
+def _insert_funny(entry: Tuple[float, str, Dict]) -> None:
+    """Insère un commit drôle dans la liste triée, sans doublon d'id.
+
+    La clé de tri se limite à (-date_ts, id) : la charge utile (dict) ne
+    participe jamais à la comparaison, deux entrées de même préfixe ne
+    peuvent donc pas déclencher un dict < dict (TypeError).
+    """
+    if entry[1] in _PUBLISHED_IDS:
+        return
+    bisect.insort(FUNNY_COMMITS, entry, key=lambda e: e[:2])
+    _PUBLISHED_IDS.add(entry[1])
+    # Éviction des plus anciens (la liste est triée par date)
+    dropped = FUNNY_COMMITS[MAX_FUNNY_COMMITS:]
+    if dropped:
+        del FUNNY_COMMITS[MAX_FUNNY_COMMITS:]
+        _PUBLISHED_IDS.difference_update(e[1] for e in dropped)
+
+
+def _publish(entry: Tuple[float, str, Dict]) -> None:
+    """Publie un commit drôle : insertion locale ou envoi au process parent."""
+    if _RESULT_QUEUE is not None:
+        _RESULT_QUEUE.put(entry)
+        return
+    _insert_funny(entry)
+
+
+def _process_new_commits() -> None:
+    """Traite une fois les commits inédits du fichier JSON.
+
+    Les commits inédits sont accumulés puis classifiés en un seul appel
+    batché : la tokenisation et le forward du modèle s'amortissent sur le
+    lot au lieu de payer le coût fixe (Python + lancement de kernels) une
+    fois par commit.
+    """
+    # 1) Passe de déduplication : pas de modèle, juste des lookups.
+    # Listes parallèles (structure of arrays) : les messages partent au
+    # modèle tels quels, sans re-extraction depuis des tuples
+    pending_meta = []
+    pending_msgs = []
+    for commit in iter_commits():
+        cid = get_commit_id(commit)
+        if _seen(cid):
+            continue
+        message = commit.get("message", "").strip()
+        if not message:
+            continue
+        pending_meta.append((cid, commit))
+        pending_msgs.append(message)
+
+    # 2) Un seul appel batché pour tous les messages en attente
+    if pending_msgs:
+        results = _get_classifier().predict_batch(pending_msgs)
+
+        # 3) Post-traitement des résultats. L'horodatage de repli est pris
+        # une fois pour tout le lot ; la chaîne ISO correspondante n'est
+        # formatée que si un commit sans date en a réellement besoin
+        now_ts = time.time()
+        now_iso = None
+        for (cid, commit), message, result in zip(pending_meta, pending_msgs, results):
+            if "error" in result:
                 # En cas d'erreur de prédiction, on ignore le commit
                 if DEBUG_MODE and logger:
-                    logger.error(f"PREDICTION ERROR: {str(e)[:50]} | {message[:50]}{'...' if len(message) > 50 else ''}")
-                PROCESSED_IDS.add(cid)
+                    logger.error(f"PREDICTION ERROR: {result['error'][:50]} | {message[:50]}{'...' if len(message) > 50 else ''}")
                 continue
+            # Log de debug sur une seule ligne
+            if DEBUG_MODE and logger:
+                status = "FUNNY" if result["is_funny"] else "NORMAL"
+                logger.info(f"PREDICTION: [{status}] P={result['probability']:.3f} | {message[:80]}{'...' if len(message) > 80 else ''}")
             if result["is_funny"]:
-                FUNNY_COMMITS.append({
+                # Date parsée une seule fois à l'insertion : la clé de
+                # tri est un flottant, plus de parsing côté lecture
+                date_iso = commit.get("author", {}).get("date")
+                if date_iso:
+                    try:
+                        date_ts = datetime.fromisoformat(date_iso.replace("Z", "+00:00")).timestamp()
+                    except ValueError:
+                        date_ts = now_ts
+                else:
+                    if now_iso is None:
+                        now_iso = datetime.fromtimestamp(now_ts).isoformat()
+                    date_iso = now_iso
+                    date_ts = now_ts
+                # date_ts entier pour les comparaisons et les clients ;
+                # la chaîne ISO d'origine est conservée pour l'affichage
+                _publish((-date_ts, cid, {
                     "id": cid,
                     "message": message,
                     "probability": result["probability"],
-                    "date": commit.get("author", {}).get("date", datetime.now().isoformat())
-                })
-            PROCESSED_IDS.add(cid)
+                    "date": date_iso,
+                    "date_ts": int(date_ts)
+                }))
+
+    # Une seule nouvelle vue par cycle, pas une par insertion
+    if _RESULT_QUEUE is None:
+        _refresh_snapshot()
+
+
+def update_commits_loop() -> None:
+    """Boucle de repli par sondage (sans watchdog)."""
+    while True:
+        _process_new_commits()
         time.sleep(UPDATE_INTERVAL)
 
 
+def _watch_commits_loop() -> None:
+    """Traitement événementiel : réveil uniquement quand le fichier change.
+
+    L'observer inotify pousse les événements de modification dans une
+    file ; le worker bloque sur queue.get() sans consommer de CPU et la
+    latence de détection passe de ~UPDATE_INTERVAL/2 à quelques ms.
+    """
+    import queue
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+
+    events: "queue.Queue" = queue.Queue()
+    target = os.path.abspath(JSON_FILE)
+
+    class _CommitsHandler(FileSystemEventHandler):
+        def on_modified(self, event):
+            if os.path.abspath(event.src_path) == target:
+                events.put(None)
+
+        on_created = on_modified
+
+        def on_moved(self, event):
+            # Réécriture atomique (fichier temporaire + os.replace) : seul
+            # un événement "moved" est émis, le fichier surveillé est la
+            # destination — sans ce réveil, plus aucune mise à jour ne
+            # serait vue puisqu'il n'y a pas de sondage de repli ici
+            if os.path.abspath(event.dest_path) == target:
+                events.put(None)
+
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(_CommitsHandler(), os.path.dirname(target) or ".", recursive=False)
+    observer.start()
+
+    # Passe initiale immédiate, puis attente bloquante des modifications
+    _process_new_commits()
+    while True:
+        events.get()
+        # Absorber la rafale d'événements d'une écriture en plusieurs temps
+        time.sleep(0.2)
+        while not events.empty():
+            try:
+                events.get_nowait()
+            except queue.Empty:
+                break
+        _process_new_commits()
+
+
+def _worker_loop() -> None:
+    """Corps du worker : charge le modèle puis surveille le fichier."""
+    _get_classifier()
+    try:
+        import watchdog  # noqa: F401
+        _watch_commits_loop()
+    except ImportError:
+        update_commits_loop()
+
+
+def _inference_worker(result_queue) -> None:
+    """Point d'entrée du process d'inférence dédié.
+
+    Le modèle et toute la glue Python (tokenisation, softmax) vivent ici :
+    les handlers Flask du process parent ne se disputent jamais le GIL
+    avec l'inférence, ce qui supprime les pics de latence pendant les
+    rafales de classification.
+    """
+    global _RESULT_QUEUE
+    _RESULT_QUEUE = result_queue
+    _worker_loop()
+
+
+def _drain_results(result_queue) -> None:
+    """Côté Flask : intègre les résultats du worker dans la liste triée."""
+    import queue
+
+    while True:
+        entry = result_queue.get()
+        _insert_funny(tuple(entry))
+        # Drainer toute la rafale avant de publier une seule nouvelle vue
+        while True:
+            try:
+                entry = result_queue.get_nowait()
+            except queue.Empty:
+                break
+            _insert_funny(tuple(entry))
+        _refresh_snapshot()
+
+
 def start_background_thread():
-    thread = threading.Thread(target=update_commits_loop, daemon=True)
+    if INFERENCE_MODE == "process":
+        import multiprocessing as mp
+
+        # fork : le worker hérite des modules déjà importés en copy-on-write
+        ctx = mp.get_context("fork")
+        result_queue = ctx.Queue()
+        ctx.Process(target=_inference_worker, args=(result_queue,), daemon=True).start()
+        threading.Thread(target=_drain_results, args=(result_queue,), daemon=True).start()
+        return
+    thread = threading.Thread(target=_worker_loop, daemon=True)
     thread.start()
 
 
+def _json(obj):
+    """Réponse JSON via orjson quand il est disponible, jsonify sinon."""
+    if orjson is not None:
+        return app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+            mimetype="application/json"
+        )
+    return jsonify(obj)
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -127,11 +449,46 @@ def index():
 
 @app.route("/funny_commits")
 def funny_commits():
-    # On renvoie les commits drôles les plus récents en premier
-    commits = sorted(FUNNY_COMMITS, key=lambda x: x["date"], reverse=True)
-    return jsonify(commits)
+    # Lecture sans verrou : une seule charge atomique du snapshot, déjà
+    # trié du plus récent au plus ancien — un slice suffit
+    limit = request.args.get("limit", DEFAULT_LIMIT, type=int)
+    snapshot = _FUNNY_SNAPSHOT
+    return _json(list(snapshot[:limit]))
 
 
-if __name__ == "__main__":
+def create_app():
+    """Point d'entrée WSGI : démarre le worker d'inférence puis renvoie l'app.
+
+    Usage : gunicorn -b 0.0.0.0:5000 -w 1 -k gthread --threads 8 'web_app:create_app()'
+    """
     start_background_thread()
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    return app
+
+
+if __name__ == "__main__":
+    try:
+        from gunicorn.app.base import BaseApplication
+
+        class _GunicornApp(BaseApplication):
+            """Gunicorn embarqué : 1 process (un seul modèle résident),
+            8 threads gthread pour recouvrir I/O réseau et lectures du
+            snapshot, keep-alive géré — là où le serveur de dev Werkzeug
+            est mono-thread avec un gros coût fixe par requête."""
+
+            def load_config(self):
+                self.cfg.set("bind", "0.0.0.0:5000")
+                self.cfg.set("workers", 1)
+                self.cfg.set("worker_class", "gthread")
+                self.cfg.set("threads", 8)
+                # Démarrage du worker d'inférence dans le process servant
+                # les requêtes, pas dans le master pré-fork
+                self.cfg.set("post_fork", lambda server, worker: start_background_thread())
+
+            def load(self):
+                return app
+
+        _GunicornApp().run()
+    except ImportError:
+        # Repli : serveur de développement Werkzeug
+        start_background_thread()
+        app.run(host="0.0.0.0", port=5000, debug=False)